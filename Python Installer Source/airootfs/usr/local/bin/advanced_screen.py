@@ -4,6 +4,7 @@ Archey — Advanced options screen.
 Kernel selection + optional extra package groups.
 """
 
+import html
 import sys
 from PyQt6.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout,
@@ -11,8 +12,7 @@ from PyQt6.QtWidgets import (
     QRadioButton, QCheckBox, QScrollArea
 )
 from PyQt6.QtCore import Qt, pyqtSignal
-from theme import (MASTER_STYLE, PINK, PINK_DIM, ROSE, BG, BG2,
-                   BORDER, TEXT, TEXT2, TEXT3)
+from theme import MASTER_STYLE, TEXT2, TEXT3
 
 KERNEL_OPTIONS = [
     {
@@ -69,14 +69,33 @@ OPTIONAL_GROUPS = [
     },
 ]
 
+# One rich-text label per card instead of separate name/desc/packages labels
+CARD_TEXT = (
+    '<span style="font-size:13px; font-weight:bold;">{name}</span><br>'
+    f'<span style="font-size:11px; color:{TEXT2};">{{desc}}</span><br>'
+    f'<span style="font-size:10px; color:{TEXT3};">Packages: {{pkgs}}</span>'
+)
 
-class KernelCard(QFrame):
-    selected = pyqtSignal(dict)
 
+def card_label(item: dict) -> QLabel:
+    """Name, description and package list of a card option as one QLabel."""
+    label = QLabel(CARD_TEXT.format(
+        name=html.escape(item["name"]),
+        desc=html.escape(item["desc"]),
+        pkgs=html.escape(", ".join(item["packages"])),
+    ))
+    label.setObjectName("cardText")
+    label.setTextFormat(Qt.TextFormat.RichText)
+    label.setWordWrap(True)
+    return label
+
+
+class KernelCard(QFrame):
     def __init__(self, option: dict, group: QButtonGroup):
         super().__init__()
         self.option = option
-        self._active = False
+        self._active = option["default"]
+        self.setObjectName("selectCard")
         self.setCursor(Qt.CursorShape.PointingHandCursor)
         self._apply_style()
 
@@ -85,63 +104,51 @@ class KernelCard(QFrame):
         row.setSpacing(12)
 
         self.radio = QRadioButton()
+        self.radio.setObjectName("cardRadio")
         self.radio.setChecked(option["default"])
-        self.radio.setStyleSheet(f"""
-            QRadioButton::indicator {{
-                width: 16px; height: 16px;
-                border-radius: 8px;
-                border: 2px solid {BORDER};
-                background: {BG};
-            }}
-            QRadioButton::indicator:checked {{
-                background: {PINK}; border-color: {PINK};
-            }}
-        """)
-        self.radio.toggled.connect(self._on_toggle)
         group.addButton(self.radio)
         row.addWidget(self.radio)
 
-        text = QVBoxLayout()
-        text.setSpacing(3)
-        name = QLabel(option["name"])
-        name.setStyleSheet(f"font-size: 13px; font-weight: bold; color: {TEXT}; background: transparent;")
-        desc = QLabel(option["desc"])
-        desc.setStyleSheet(f"font-size: 11px; color: {TEXT2}; background: transparent;")
-        desc.setWordWrap(True)
-        pkgs = QLabel(f"Packages: {', '.join(option['packages'])}")
-        pkgs.setStyleSheet(f"font-size: 10px; color: {TEXT3}; background: transparent;")
-        text.addWidget(name); text.addWidget(desc); text.addWidget(pkgs)
-        row.addLayout(text, stretch=1)
-
-    def _on_toggle(self, checked: bool):
-        self._active = checked
+        row.addWidget(card_label(option), stretch=1)
+
+    def set_active(self, active: bool):
+        if self._active == active:
+            return   # no visual change, skip the re-polish
+        self._active = active
         self._apply_style()
-        if checked:
-            self.selected.emit(self.option)
 
     def _apply_style(self):
-        if self._active:
-            self.setStyleSheet(f"""
-                QFrame {{
-                    background-color: {PINK_DIM};
-                    border: 2px solid {ROSE};
-                    border-radius: 10px;
-                }}
-            """)
-        else:
-            self.setStyleSheet(f"""
-                QFrame {{
-                    background-color: {BG2};
-                    border: 1px solid {BORDER};
-                    border-radius: 10px;
-                }}
-                QFrame:hover {{ border-color: {ROSE}; }}
-            """)
+        # Rules live in MASTER_STYLE; flip the property and re-polish
+        self.setProperty("active", self._active)
+        self.style().unpolish(self)
+        self.style().polish(self)
 
     def mousePressEvent(self, event):
         self.radio.setChecked(True)
 
 
+class OptionalGroupCard(QFrame):
+    """Checkbox card for one optional package group."""
+    MARGINS = (14, 12, 14, 12)
+    SPACING = 10
+
+    def __init__(self, group: dict):
+        super().__init__()
+        self.group = group
+        self.setObjectName("optCard")
+
+        row = QHBoxLayout(self)
+        row.setContentsMargins(*self.MARGINS)
+        row.setSpacing(self.SPACING)
+
+        self.chk = QCheckBox()
+        self.chk.setObjectName("cardCheck")
+        self.chk.setChecked(group["default"])
+        row.addWidget(self.chk)
+
+        row.addWidget(card_label(group), stretch=1)
+
+
 class AdvancedScreen(QWidget):
     confirmed = pyqtSignal(str, list)
     back = pyqtSignal()
@@ -151,7 +158,15 @@ class AdvancedScreen(QWidget):
         self.setStyleSheet(MASTER_STYLE)
         self._selected_kernel = next(o for o in KERNEL_OPTIONS if o["default"])
         self._checks = {}
-        self._build_ui()
+        self._kernel_cards = {}   # radio button -> KernelCard
+        self._built = False
+
+    def showEvent(self, event):
+        # Cards are only built the first time the screen is actually shown
+        if not self._built:
+            self._build_ui()
+            self._built = True
+        super().showEvent(event)
 
     def _build_ui(self):
         root = QVBoxLayout(self)
@@ -181,53 +196,17 @@ class AdvancedScreen(QWidget):
         group = QButtonGroup(self)
         for opt in KERNEL_OPTIONS:
             c = KernelCard(opt, group)
-            c.selected.connect(lambda o, self=self: setattr(self, "_selected_kernel", o))
+            self._kernel_cards[c.radio] = c
             v.addWidget(c)
+        group.buttonToggled.connect(self._on_kernel_toggled)
 
         sec2 = QLabel("OPTIONAL EXTRAS")
         sec2.setObjectName("sec")
         v.addWidget(sec2)
 
         for grp in OPTIONAL_GROUPS:
-            card = QFrame()
-            card.setStyleSheet(f"""
-                QFrame {{
-                    background-color: {BG2};
-                    border: 1px solid {BORDER};
-                    border-radius: 10px;
-                }}
-            """)
-            row = QHBoxLayout(card)
-            row.setContentsMargins(14, 12, 14, 12)
-            row.setSpacing(10)
-
-            chk = QCheckBox()
-            chk.setChecked(grp["default"])
-            chk.setStyleSheet(f"""
-                QCheckBox::indicator {{
-                    width: 16px; height: 16px;
-                    border-radius: 3px;
-                    border: 2px solid {BORDER};
-                    background: {BG};
-                }}
-                QCheckBox::indicator:checked {{
-                    background: {PINK}; border-color: {PINK};
-                }}
-            """)
-            row.addWidget(chk)
-
-            txt = QVBoxLayout()
-            name = QLabel(grp["name"])
-            name.setStyleSheet(f"font-size: 13px; font-weight: bold; color: {TEXT}; background: transparent;")
-            desc = QLabel(grp["desc"])
-            desc.setStyleSheet(f"font-size: 11px; color: {TEXT2}; background: transparent;")
-            desc.setWordWrap(True)
-            pkgs = QLabel(f"Packages: {', '.join(grp['packages'])}")
-            pkgs.setStyleSheet(f"font-size: 10px; color: {TEXT3}; background: transparent;")
-            txt.addWidget(name); txt.addWidget(desc); txt.addWidget(pkgs)
-            row.addLayout(txt, stretch=1)
-
-            self._checks[grp["id"]] = (chk, grp["packages"])
+            card = OptionalGroupCard(grp)
+            self._checks[grp["id"]] = (card.chk, grp["packages"])
             v.addWidget(card)
 
         v.addStretch()
@@ -248,6 +227,13 @@ class AdvancedScreen(QWidget):
         btns.addWidget(cont_btn)
         root.addLayout(btns)
 
+    def _on_kernel_toggled(self, button, checked: bool):
+        # Fires once for the card losing the check and once for the new one
+        card = self._kernel_cards[button]
+        card.set_active(checked)
+        if checked:
+            self._selected_kernel = card.option
+
     def _on_confirm(self):
         extra = []
         for _, (chk, pkgs) in self._checks.items():
@@ -6,52 +6,159 @@ Runs entirely in a background thread, emits progress signals to the UI.
 """
 
 import subprocess
+import collections
+import functools
+import itertools
+import json
+import math
 import os
+import re
+import shlex
+import shutil
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from PyQt6.QtCore import QThread, pyqtSignal
 
 
 # ── Packages ──────────────────────────────────────────────────────────────────
 
-BASE_PACKAGES = [
+# Tuples so the shared package lists can't be mutated by an install run
+BASE_PACKAGES = (
     "base", "base-devel", "linux-firmware",
     "mkinitcpio", "networkmanager", "iwd",
     "sudo", "nano", "vim", "git", "curl", "wget",
     "grub", "efibootmgr", "os-prober",
     "bash-completion", "man-db", "man-pages",
-]
+)
 
 KERNEL_PACKAGES = {
-    "linux": ["linux", "linux-headers"],
-    "linux-zen": ["linux-zen", "linux-zen-headers"],
-    "linux-hardened": ["linux-hardened", "linux-hardened-headers"],
-    "linux-lts": ["linux-lts", "linux-lts-headers"],
+    "linux": ("linux", "linux-headers"),
+    "linux-zen": ("linux-zen", "linux-zen-headers"),
+    "linux-hardened": ("linux-hardened", "linux-hardened-headers"),
+    "linux-lts": ("linux-lts", "linux-lts-headers"),
 }
 
 CPU_PACKAGES = {
-    "intel": ["intel-ucode"],
-    "amd":   ["amd-ucode"],
+    "intel": ("intel-ucode",),
+    "amd":   ("amd-ucode",),
 }
 
+# Share of the overall progress bar each install step covers (sums to 100)
+STEP_WEIGHTS = {
+    "partition": 5,  "format": 5,     "mount": 2,
+    "pacstrap":  40, "fstab": 2,      "configure": 10,
+    "grub":      25, "de": 10,        "cleanup": 1,
+}
+_STEP_START = dict(zip(STEP_WEIGHTS, itertools.accumulate(STEP_WEIGHTS.values(), initial=0)))
+
+# Minimum gap between sub-step progress signals, in seconds
+PROGRESS_INTERVAL = 0.05
+
+# How much of a failed command's output _run keeps for the error message
+ERROR_TAIL_LINES = 10
+ERROR_TAIL_CHARS = 500
+
+# pacman's per-package line; the counter is space-padded when piped,
+# e.g. "( 12/345) installing linux-firmware..."
+_PACMAN_INSTALLING_RE = re.compile(r"\(\s*(\d+)/\s*(\d+)\) installing (\S+)")
+
+# Trailing partition number, e.g. "3" from "sda3" or "nvme0n1p3"
+_PART_NUM_RE = re.compile(r"(\d+)$")
+
+# /etc/default/grub keys _install_grub sets itself; existing lines are dropped
+_GRUB_OVERRIDDEN_KEYS = (
+    "GRUB_THEME=", "GRUB_BACKGROUND=",
+    "GRUB_GFXMODE=", "GRUB_GFXPAYLOAD_LINUX=",
+    "GRUB_DISABLE_OS_PROBER=",
+)
+
+# efibootmgr output: "BootOrder: 0003,0001" and active "Boot0001* Archey" lines
+_EFI_ORDER_RE = re.compile(r"^\s*BootOrder:\s*(.+)$", re.M)
+_EFI_ENTRY_RE = re.compile(r"^\s*Boot([0-9A-Fa-f]{4})\*\s*([^\t\n]*)", re.M)
+
+# Lower-cased EFI entry labels we treat as ours
+_ARCH_LABEL_RE = re.compile(r"archey|arch linux|^arch$")
+
+# Chroot setup script, filled in with str.format_map by _configure
+SETUP_TEMPLATE = "/usr/local/share/archey/arch_setup.sh.tmpl"
+
+# Commented-out [multilib] section in pacman.conf
+_MULTILIB_RE = re.compile(r"^#\s*\[multilib\]\s*\n#\s*Include\s*=\s*(.+)$", re.M)
+
 
 # ── Helpers ───────────────────────────────────────────────────────────────────
 
 # Note: state.keymap added by installer.py
+@functools.lru_cache(maxsize=1)
 def detect_cpu() -> str:
     """Returns 'intel', 'amd', or 'unknown'."""
     try:
         with open("/proc/cpuinfo") as f:
-            info = f.read().lower()
-        if "intel" in info:
-            return "intel"
-        if "amd" in info:
-            return "amd"
+            # vendor_id is on the first CPU's block; no need to read the rest
+            for line in f:
+                if line.startswith("vendor_id"):
+                    vendor = line.split(":", 1)[1].strip()
+                    if vendor == "GenuineIntel":
+                        return "intel"
+                    if vendor == "AuthenticAMD":
+                        return "amd"
+                    break
     except Exception:
         pass
     return "unknown"
 
 
+@functools.lru_cache(maxsize=1)
+def load_setup_template() -> str:
+    """Read the chroot setup script template once per process."""
+    with open(SETUP_TEMPLATE) as f:
+        return f.read()
+
+
+@functools.lru_cache(maxsize=None)
+def which(name: str) -> str:
+    """Absolute path of a binary on $PATH, looked up once per name."""
+    return shutil.which(name) or name
+
+
+def resolve_cmd(cmd: list) -> list:
+    """Swap the program name in cmd for its absolute path."""
+    return [which(cmd[0]), *cmd[1:]]
+
+
+def enable_multilib(conf_path: str) -> bool:
+    """Uncomment [multilib] in a pacman.conf. Returns True if the file changed."""
+    with open(conf_path) as f:
+        conf = f.read()
+    new = _MULTILIB_RE.sub(r"[multilib]\nInclude = \1", conf)
+    if new == conf:
+        return False
+    with open(conf_path, "w") as f:
+        f.write(new)
+    return True
+
+
+def link_or_copy_tree(src: str, dst: str, skip: tuple = ()):
+    """
+    Copy the contents of src into dst, hardlinking files where possible.
+    Falls back to a real copy when src and dst are on different filesystems.
+    """
+    os.makedirs(dst, exist_ok=True)
+    with os.scandir(src) as it:
+        for entry in it:
+            if entry.name in skip:
+                continue
+            target = os.path.join(dst, entry.name)
+            if entry.is_dir():
+                link_or_copy_tree(entry.path, target)
+            else:
+                try:
+                    os.link(entry.path, target)
+                except OSError:
+                    shutil.copy2(entry.path, target)
+
+
 def part_name(disk: str, num: int) -> str:
     """
     Returns partition path e.g. /dev/sda1 or /dev/nvme0n1p1.
@@ -74,6 +181,8 @@ class InstallWorker(QThread):
     def __init__(self, state):
         super().__init__()
         self.state = state
+        self._last_pct  = -1
+        self._last_emit = 0.0
 
     # ── Main run ──────────────────────────────────────────────────────────────
 
@@ -84,40 +193,40 @@ class InstallWorker(QThread):
             mode      = s.install_mode
 
             # ── Step 1: Partition the disk ─────────────────────────────────
-            self._progress("Partitioning disk…", 5)
+            self._step("partition", "Partitioning disk…")
             efi_part, root_part = self._partition(disk_path, mode, s)
 
             # ── Step 2: Format ─────────────────────────────────────────────
-            self._progress("Formatting partitions…", 15)
+            self._step("format", "Formatting partitions…")
             self._format(efi_part, root_part, mode)
 
             # ── Step 3: Mount ──────────────────────────────────────────────
-            self._progress("Mounting partitions…", 20)
+            self._step("mount", "Mounting partitions…")
             self._mount(efi_part, root_part)
 
             # ── Step 4: pacstrap ───────────────────────────────────────────
-            self._progress("Installing base system (this may take a while)…", 25)
+            self._step("pacstrap", "Installing base system (this may take a while)…")
             self._pacstrap(s)
 
             # ── Step 5: fstab ──────────────────────────────────────────────
-            self._progress("Generating fstab…", 60)
+            self._step("fstab", "Generating fstab…")
             self._genfstab()
 
             # ── Step 6: chroot config ──────────────────────────────────────
-            self._progress("Configuring system…", 65)
+            self._step("configure", "Configuring system…")
             self._configure(s, efi_part, root_part)
 
             # ── Step 7: Bootloader ─────────────────────────────────────────
-            self._progress("Installing bootloader…", 85)
+            self._step("grub", "Installing bootloader…")
             self._install_grub(s)
 
             # ── Step 8: Desktop environment ────────────────────────────────
             if s.de and s.de.get("packages"):
-                self._progress(f"Installing {s.de['name']}…", 88)
+                self._step("de", f"Installing {s.de['name']}…")
                 self._install_de(s)
 
             # ── Step 9: Cleanup ────────────────────────────────────────────
-            self._progress("Cleaning up…", 97)
+            self._step("cleanup", "Cleaning up…")
             self._cleanup()
 
             self._progress("Installation complete!", 100)
@@ -161,8 +270,7 @@ class InstallWorker(QThread):
             disk_path
         ])
 
-        time.sleep(1)  # let kernel re-read partition table
-        self._run(["partprobe", disk_path])
+        self._reread_partitions(disk_path)
 
         efi_part  = part_name(disk_path, 1)
         root_part = part_name(disk_path, 2)
@@ -178,37 +286,37 @@ class InstallWorker(QThread):
 
         efi_part = f"/dev/{s.efi_partition['name']}"
 
-        # Use parted to find the free space and create a partition there
-        # Get the end of the last partition in MB
+        # Use parted to find the free space and create a partition there.
+        # Machine mode prints "num:start:end:size:free;" rows for free space
         result = self._run_output([
-            "parted", "-s", disk_path, "unit", "MB", "print", "free"
+            "parted", "-s", "-m", disk_path, "unit", "MB", "print", "free"
         ])
         # Find the last free space block
         free_start = None
         for line in result.splitlines():
-            if "Free Space" in line:
-                parts = line.split()
-                free_start = parts[0]  # start of free space
+            fields = line.rstrip(";").split(":")
+            if len(fields) >= 5 and fields[4] == "free":
+                free_start = float(fields[1].rstrip("MB"))
 
-        if not free_start:
+        if free_start is None:
             raise RuntimeError("Could not find free space on disk.")
 
         size_mb = int(s.arch_size_gb * 1024)
-        end = f"{int(free_start.replace('MB','').strip()) + size_mb}MB"
+        # Round up: rounding parted's fractional MB down could start the new
+        # partition inside the one before the free region
+        start = math.ceil(free_start)
+        end = start + size_mb
 
         self._run([
             "parted", "-s", disk_path,
             "mkpart", "primary", "ext4",
-            free_start, end
+            f"{start}MB", f"{end}MB"
         ])
 
-        time.sleep(1)
-        self._run(["partprobe", disk_path])
+        self._reread_partitions(disk_path)
 
         # Root partition is the last one
-        result2 = self._run_output(["lsblk", "-ln", "-o", "NAME", disk_path])
-        children = [l.strip() for l in result2.splitlines() if l.strip() and l.strip() != disk_path.replace("/dev/","")]
-        root_part = f"/dev/{children[-1]}"
+        root_part = f"/dev/{self._list_partitions(disk_path)[-1]['name']}"
 
         self._log(f"Root partition: {root_part}  EFI: {efi_part}")
         return efi_part, root_part
@@ -242,7 +350,10 @@ class InstallWorker(QThread):
 
         # Then resize the actual partition with parted
         # Find which partition number the windows partition is
-        win_num = ''.join(filter(str.isdigit, s.windows_partition["name"]))
+        m = _PART_NUM_RE.search(s.windows_partition["name"])
+        if not m:
+            raise RuntimeError(f"Could not determine partition number of {win_part}")
+        win_num = m.group(1)
         shrink_mb = int(shrink_to_gb * 1024)
 
         self._run([
@@ -250,9 +361,6 @@ class InstallWorker(QThread):
             "resizepart", win_num, f"{shrink_mb}MB"
         ])
 
-        time.sleep(1)
-        self._run(["partprobe", disk_path])
-
         # Create root partition in the now-free space
         self._run([
             "parted", "-s", disk_path,
@@ -260,17 +368,32 @@ class InstallWorker(QThread):
             f"{shrink_mb}MB", f"{shrink_mb + int(s.arch_size_gb * 1024)}MB"
         ])
 
-        time.sleep(1)
-        self._run(["partprobe", disk_path])
+        # One re-read covers both the resize and the new partition
+        self._reread_partitions(disk_path)
 
         # Root is the last partition
-        result = self._run_output(["lsblk", "-ln", "-o", "NAME", disk_path])
-        children = [l.strip() for l in result.splitlines() if l.strip() and l.strip() != disk_path.replace("/dev/","")]
-        root_part = f"/dev/{children[-1]}"
+        root_part = f"/dev/{self._list_partitions(disk_path)[-1]['name']}"
 
         self._log(f"Dualboot partitions ready — EFI: {efi_part}  Root: {root_part}")
         return efi_part, root_part
 
+    def _reread_partitions(self, disk_path: str):
+        """Have the kernel re-read the table and wait for udev to publish the nodes."""
+        self._run(["partprobe", disk_path])
+        # A settle timeout only means the udev queue is slow, not that the
+        # nodes are missing — note it and carry on
+        if self._run(["udevadm", "settle", "--timeout=10"], check=False).returncode != 0:
+            self._log("Warning: udevadm settle timed out, continuing")
+
+    def _list_partitions(self, disk_path: str) -> list[dict]:
+        """Partitions of disk_path in table order, from one lsblk JSON call."""
+        out = self._run_output(["lsblk", "-J", "-b", "-o", "NAME,TYPE", disk_path])
+        children = json.loads(out)["blockdevices"][0].get("children", [])
+        parts = [c for c in children if c.get("type") == "part"]
+        if not parts:
+            raise RuntimeError(f"No partitions found on {disk_path}.")
+        return parts
+
     # ── Format ────────────────────────────────────────────────────────────────
 
     def _format(self, efi_part: str, root_part: str, mode: str):
@@ -296,46 +419,44 @@ class InstallWorker(QThread):
     # ── pacstrap ──────────────────────────────────────────────────────────────
 
     def _pacstrap(self, s):
-        pkgs = BASE_PACKAGES.copy()
-
-        # Selected kernel package set (fallback to regular linux)
+        # Base + selected kernel (fallback to regular linux) + CPU/GPU
+        # packages from the hardware screen
         kernel_choice = getattr(s, "kernel_choice", "linux")
-        pkgs += KERNEL_PACKAGES.get(kernel_choice, KERNEL_PACKAGES["linux"])
-
-        # CPU and GPU packages from hardware screen selection
-        pkgs += getattr(s, "cpu_packages", [])
-        pkgs += getattr(s, "gpu_packages", [])
+        base = itertools.chain(
+            BASE_PACKAGES,
+            KERNEL_PACKAGES.get(kernel_choice, KERNEL_PACKAGES["linux"]),
+            getattr(s, "cpu_packages", []),
+            getattr(s, "gpu_packages", []),
+        )
 
-        # Add user-selected packages (search picks + advanced extras + system setup)
+        # Add user-selected packages (search picks + advanced extras + system setup);
+        # DE packages are installed later in the chroot
         de_pkgs   = set(s.de.get("packages", [])) if s.de else set()
         all_extra = (
             getattr(s, "user_packages",     []) +
             getattr(s, "advanced_packages", []) +
             getattr(s, "system_packages",   [])
         )
-        seen_extra = set(pkgs)
-        for p in all_extra:
-            if p not in seen_extra and p not in de_pkgs:
-                pkgs.append(p)
-                seen_extra.add(p)
+        extras = [p for p in all_extra if p not in de_pkgs]
+
+        # dict.fromkeys dedupes while keeping first-seen order
+        pkgs = list(dict.fromkeys(itertools.chain(base, extras)))
         self._log(f"Total packages: {len(pkgs)}")
 
         self._log(f"Running pacstrap with {len(pkgs)} packages")
 
         # Ensure live ISO pacman has multilib enabled (needed for lib32 packages)
         try:
-            with open("/etc/pacman.conf") as f:
-                conf = f.read()
-            if "#[multilib]" in conf:
-                conf = conf.replace("#[multilib]\n#Include", "[multilib]\nInclude")
-                with open("/etc/pacman.conf", "w") as f:
-                    f.write(conf)
+            if enable_multilib("/etc/pacman.conf"):
                 self._run(["pacman", "-Sy", "--noconfirm"])
                 self._log("Multilib enabled on live ISO")
         except Exception as e:
             self._log(f"Warning: could not enable multilib: {e}")
 
-        self._run(["pacstrap", "/mnt"] + pkgs)
+        # Stream pacstrap so the bar moves through the pacstrap step as
+        # pacman installs each package
+        self._run(["pacstrap", "/mnt"] + pkgs,
+                  on_line=self._pacman_progress("pacstrap"))
 
     # ── fstab ─────────────────────────────────────────────────────────────────
 
@@ -355,70 +476,21 @@ class InstallWorker(QThread):
         cpu = detect_cpu()
         ucode = f"{cpu}-ucode" if cpu in ("intel", "amd") else ""
 
-        script = f"""#!/bin/bash
-set -e
-
-# Timezone
-ln -sf /usr/share/zoneinfo/{s.timezone} /etc/localtime
-hwclock --systohc
-
-# Locale
-echo "{s.locale} UTF-8" >> /etc/locale.gen
-locale-gen
-echo "LANG={s.locale}" > /etc/locale.conf
-
-# Enable multilib repo (needed for lib32 packages like lib32-mesa, lib32-nvidia-utils)
-sed -i '/^#\\[multilib\\]/{{N;s/#\\[multilib\\]\\n#Include/[multilib]\\nInclude/}}' /etc/pacman.conf || true
-
-# Hostname
-echo "{s.hostname}" > /etc/hostname
-cat > /etc/hosts << 'EOF'
-127.0.0.1   localhost
-::1         localhost
-127.0.1.1   {s.hostname}.localdomain {s.hostname}
-EOF
-
-# Keymap / vconsole (TTY)
-echo "KEYMAP={s.keymap}" > /etc/vconsole.conf
-
-# X11 keyboard config — localectl can't run in chroot, write the file directly
-mkdir -p /etc/X11/xorg.conf.d
-cat > /etc/X11/xorg.conf.d/00-keyboard.conf << 'KBEOF'
-Section "InputClass"
-    Identifier "system-keyboard"
-    MatchIsKeyboard "on"
-    Option "XkbLayout" "{s.keymap}"
-EndSection
-KBEOF
-
-# Initramfs — non-fatal, warnings are OK
-mkinitcpio -P || echo "mkinitcpio finished with warnings, continuing"
-
-# Root password (locked — user will use sudo)
-passwd -l root
-
-# Create user
-useradd -m -G wheel,audio,video,storage,optical -s /bin/bash "{s.username}"
-echo "{s.username}:{s.password}" | chpasswd
-
-# Sudo for wheel group
-echo "%wheel ALL=(ALL:ALL) ALL" > /etc/sudoers.d/wheel
-chmod 440 /etc/sudoers.d/wheel
-
-# Enable NetworkManager — critical for post-install networking
-systemctl enable NetworkManager.service || echo "WARNING: NetworkManager enable failed"
-systemctl enable systemd-resolved.service 2>/dev/null || true
-
-# Enable iwd for wifi
-systemctl enable iwd.service 2>/dev/null || true
-
-# Enable user-chosen system services
-for svc in {' '.join(getattr(s, 'system_services', []))}; do
-    systemctl enable "$svc" 2>/dev/null || echo "Note: $svc not enabled"
-done
-
-# Display manager will be enabled after DE packages are installed
-"""
+        # Enable multilib repo in the target (needed for lib32 packages like
+        # lib32-mesa, lib32-nvidia-utils)
+        try:
+            enable_multilib("/mnt/etc/pacman.conf")
+        except OSError as e:
+            self._log(f"Warning: could not enable multilib in target: {e}")
+
+        script = load_setup_template().format_map({
+            "timezone":        s.timezone,
+            "locale":          s.locale,
+            "hostname":        s.hostname,
+            "keymap":          s.keymap,
+            "username":        s.username,
+            "system_services": " ".join(getattr(s, "system_services", [])),
+        })
 
         script_path = "/mnt/root/arch_setup.sh"
         with open(script_path, "w") as f:
@@ -429,98 +501,37 @@ done
         self._run(["arch-chroot", "/mnt", "/root/arch_setup.sh"])
         os.remove(script_path)
 
+        # Set the user password over stdin so it never lands in the script
+        # file on disk or in any process's argv
+        self._log(f"Setting password for {s.username}")
+        self._run(["arch-chroot", "/mnt", "chpasswd"],
+                  input=f"{s.username}:{s.password}\n")
+
     # ── GRUB ──────────────────────────────────────────────────────────────────
 
     def _install_grub(self, s):
-        import shutil
         self._log("Installing GRUB bootloader")
 
-        # ── 1. Install grub-install to EFI ────────────────────────────────
-        self._run([
-            "arch-chroot", "/mnt",
-            "grub-install",
-            "--target=x86_64-efi",
-            "--efi-directory=/boot/efi",
-            "--bootloader-id=Archey",
-            "--recheck",
-            "--removable",   # writes fallback EFI path so firmware always finds it
-        ])
-
-        # ── 2. Copy theme files first (before grub-mkconfig!) ─────────────
-        theme_src = "/usr/local/share/archey-grub"
-        theme_dst = "/mnt/boot/grub/themes/archey"
-
-        if os.path.isdir(theme_src):
-            self._log("Copying Archey GRUB theme...")
-            if os.path.exists(theme_dst):
-                shutil.rmtree(theme_dst)
-            os.makedirs(theme_dst, exist_ok=True)
+        # The theme copy only touches /mnt/boot/grub/themes, so it can run
+        # while grub-install writes the EFI image and modules
+        with ThreadPoolExecutor(max_workers=1) as ex:
+            theme_job = ex.submit(self._copy_grub_theme)
 
-            # Auto-detect nesting: if source only contains a single subdir
-            # and no theme.txt, the real files are one level deeper
-            src_items = os.listdir(theme_src)
-            actual_src = theme_src
-            if "theme.txt" not in src_items:
-                subdirs = [i for i in src_items
-                           if os.path.isdir(os.path.join(theme_src, i))]
-                if len(subdirs) == 1:
-                    actual_src = os.path.join(theme_src, subdirs[0])
-                    self._log(f"Detected nested theme folder, using {actual_src}")
+            # ── 1. Install grub-install to EFI ────────────────────────────
+            self._run([
+                "arch-chroot", "/mnt",
+                "grub-install",
+                "--target=x86_64-efi",
+                "--efi-directory=/boot/efi",
+                "--bootloader-id=Archey",
+                "--recheck",
+                "--removable",   # writes fallback EFI path so firmware always finds it
+            ])
 
-            # Copy contents of actual_src flat into theme_dst
-            for item in os.listdir(actual_src):
-                if item in ("install_theme.sh",):
-                    continue   # skip stray scripts
-                src_item = os.path.join(actual_src, item)
-                dst_item = os.path.join(theme_dst, item)
-                if os.path.isdir(src_item):
-                    shutil.copytree(src_item, dst_item)
-                else:
-                    shutil.copy2(src_item, dst_item)
-
-            # ── 3. Install grub-mkfont if missing, then generate PF2 fonts ─
-            # grub-mkfont lives in the 'grub' package which we already installed
-            # Run font generation directly from the live ISO (not chroot)
-            # since the fonts we need are on the ISO's filesystem
-            self._log("Generating GRUB PF2 fonts...")
-
-            # Find a monospace font available on the ISO
-            fc = subprocess.run(
-                ["fc-match", "DejaVu Sans Mono:style=Book", "--format=%{file}"],
-                capture_output=True, text=True
-            )
-            fc_bold = subprocess.run(
-                ["fc-match", "DejaVu Sans Mono:style=Bold", "--format=%{file}"],
-                capture_output=True, text=True
-            )
-            freg  = fc.stdout.strip()
-            fbold = fc_bold.stdout.strip()
+            self._step_progress("grub", 0.4, "Installing GRUB theme…")
 
-            if not freg or not os.path.exists(freg):
-                self._log("Warning: could not find font file, skipping PF2 generation")
-            else:
-                fonts = [
-                    (11, freg,  "Archey 11",         "archey-11.pf2"),
-                    (12, freg,  "Archey 12",         "archey-12.pf2"),
-                    (13, freg,  "Archey 13",         "archey-13.pf2"),
-                    (14, freg,  "Archey 14",         "archey-14.pf2"),
-                    (16, freg,  "Archey Regular 16", "archey-reg-16.pf2"),
-                    (16, fbold, "Archey Bold 16",    "archey-bold-16.pf2"),
-                    (24, fbold, "Archey Bold 24",    "archey-bold-24.pf2"),
-                ]
-                for size, src, name, out in fonts:
-                    if not src or not os.path.exists(src):
-                        src = freg   # fall back to regular
-                    out_path = os.path.join(theme_dst, out)
-                    self._run([
-                        "grub-mkfont", "-s", str(size),
-                        "-n", name,
-                        "-o", out_path,
-                        src
-                    ], check=False)
-                self._log("Fonts generated")
-        else:
-            self._log(f"Warning: theme source not found at {theme_src} — using default GRUB theme")
+            # ── 2./3. Theme files + fonts must be in place before mkconfig ─
+            theme_job.result()
 
         # ── 4. Configure /etc/default/grub with theme + gfx BEFORE mkconfig ─
         grub_cfg = "/mnt/etc/default/grub"
@@ -531,11 +542,7 @@ done
 
         # Strip any existing conflicting lines
         lines = [l for l in cfg_text.splitlines()
-                 if not any(l.startswith(k) for k in (
-                     "GRUB_THEME=", "GRUB_BACKGROUND=",
-                     "GRUB_GFXMODE=", "GRUB_GFXPAYLOAD_LINUX=",
-                     "GRUB_DISABLE_OS_PROBER=",
-                 ))]
+                 if not l.startswith(_GRUB_OVERRIDDEN_KEYS)]
 
         lines += [
             "",
@@ -554,6 +561,7 @@ done
             self._run(["arch-chroot", "/mnt", "os-prober"], check=False)
 
         # ── 6. Generate final grub.cfg (theme is now set) ─────────────────
+        self._step_progress("grub", 0.6, "Generating GRUB config…")
         self._run([
             "arch-chroot", "/mnt",
             "grub-mkconfig", "-o", "/boot/grub/grub.cfg"
@@ -564,50 +572,124 @@ done
 
         self._log("GRUB installed and configured with Archey theme")
 
+    def _copy_grub_theme(self):
+        """Copy the Archey GRUB theme and its PF2 fonts into the target."""
+        theme_src = "/usr/local/share/archey-grub"
+        theme_dst = "/mnt/boot/grub/themes/archey"
+
+        if os.path.isdir(theme_src):
+            self._log("Copying Archey GRUB theme...")
+            if os.path.exists(theme_dst):
+                shutil.rmtree(theme_dst)
+            os.makedirs(theme_dst, exist_ok=True)
+
+            # Auto-detect nesting: if source only contains a single subdir
+            # and no theme.txt, the real files are one level deeper
+            src_items = os.listdir(theme_src)
+            actual_src = theme_src
+            if "theme.txt" not in src_items:
+                subdirs = [i for i in src_items if i != "fonts"
+                           and os.path.isdir(os.path.join(theme_src, i))]
+                if len(subdirs) == 1:
+                    actual_src = os.path.join(theme_src, subdirs[0])
+                    self._log(f"Detected nested theme folder, using {actual_src}")
+
+            # Copy contents of actual_src flat into theme_dst
+            # (skip stray scripts; fonts are handled below)
+            link_or_copy_tree(actual_src, theme_dst,
+                              skip=("install_theme.sh", "fonts"))
+
+            # ── 3. Copy prebuilt PF2 fonts, or generate them as a fallback ─
+            # The PF2s are identical on every install, so the ISO build ships
+            # them under <theme_src>/fonts and we just copy them flat into the
+            # theme dir (GRUB only picks up *.pf2 from the theme dir itself)
+            fonts_src = next((d for d in (os.path.join(theme_src, "fonts"),
+                                          os.path.join(actual_src, "fonts"))
+                              if os.path.isdir(d)), None)
+            if fonts_src:
+                self._log("Copying prebuilt GRUB PF2 fonts...")
+                link_or_copy_tree(fonts_src, theme_dst)
+            else:
+                # grub-mkfont lives in the 'grub' package which we already installed
+                # Run font generation directly from the live ISO (not chroot)
+                # since the fonts we need are on the ISO's filesystem
+                self._log("Generating GRUB PF2 fonts...")
+
+                # Find a monospace font available on the ISO (both lookups at once)
+                with ThreadPoolExecutor(max_workers=2) as ex:
+                    freg, fbold = ex.map(
+                        lambda q: subprocess.run(
+                            [which("fc-match"), q, "--format=%{file}"],
+                            capture_output=True, text=True
+                        ).stdout.strip(),
+                        ["DejaVu Sans Mono:style=Book", "DejaVu Sans Mono:style=Bold"],
+                    )
+
+                if not freg or not os.path.exists(freg):
+                    self._log("Warning: could not find font file, skipping PF2 generation")
+                else:
+                    fonts = [
+                        (11, freg,  "Archey 11",         "archey-11.pf2"),
+                        (12, freg,  "Archey 12",         "archey-12.pf2"),
+                        (13, freg,  "Archey 13",         "archey-13.pf2"),
+                        (14, freg,  "Archey 14",         "archey-14.pf2"),
+                        (16, freg,  "Archey Regular 16", "archey-reg-16.pf2"),
+                        (16, fbold, "Archey Bold 16",    "archey-bold-16.pf2"),
+                        (24, fbold, "Archey Bold 24",    "archey-bold-24.pf2"),
+                    ]
+                    for size, src, name, out in fonts:
+                        if not src or not os.path.exists(src):
+                            src = freg   # fall back to regular
+                        out_path = os.path.join(theme_dst, out)
+                        self._run([
+                            "grub-mkfont", "-s", str(size),
+                            "-n", name,
+                            "-o", out_path,
+                            src
+                        ], check=False)
+                    self._log("Fonts generated")
+        else:
+            self._log(f"Warning: theme source not found at {theme_src} — using default GRUB theme")
+
     def _prioritize_boot_entry(self):
         """Move Archey/Arch EFI boot entry to the front of BootOrder (non-fatal)."""
+        # efivars are the same kernel interface inside and outside the
+        # chroot, so run the live ISO's efibootmgr directly
         try:
-            out = self._run_output(["arch-chroot", "/mnt", "efibootmgr"])
+            out = self._run_output(["efibootmgr"])
         except Exception as e:
             self._log(f"Warning: could not read EFI boot entries: {e}")
             return
 
-        lines = out.splitlines()
-        boot_order = None
-        entries = {}
-
-        for line in lines:
-            line = line.strip()
-            if line.startswith("BootOrder:"):
-                boot_order = [x.strip().upper() for x in line.split(":", 1)[1].split(",") if x.strip()]
-                continue
-
-            if line.startswith("Boot") and "*" in line and len(line) >= 8:
-                # Example: Boot0001* Archey
-                boot_id = line[4:8].upper()
-                label = line.split("*", 1)[1].strip().lower()
-                entries[boot_id] = label
+        # Example lines: "BootOrder: 0003,0001"  /  "Boot0001* Archey"
+        m = _EFI_ORDER_RE.search(out)
+        boot_order = [x.strip().upper() for x in m.group(1).split(",") if x.strip()] if m else []
 
         if not boot_order:
             self._log("Warning: EFI BootOrder not found; skipping boot prioritization")
             return
 
-        preferred = None
-        for bid, label in entries.items():
-            if "archey" in label or "arch linux" in label or "arch" == label:
-                preferred = bid
-                break
+        # First active entry whose label looks like ours; stops scanning there
+        preferred = next((m.group(1).upper() for m in _EFI_ENTRY_RE.finditer(out)
+                          if _ARCH_LABEL_RE.search(m.group(2).strip().lower())), None)
 
         if not preferred:
             self._log("Warning: no Archey/Arch EFI entry found to prioritize")
             return
 
-        new_order = [preferred] + [b for b in boot_order if b != preferred]
-        order_str = ",".join(new_order)
+        if boot_order[0] == preferred:
+            self._log(f"EFI entry {preferred} is already first in BootOrder")
+            return
 
-        res = self._run([
-            "arch-chroot", "/mnt", "efibootmgr", "-o", order_str
-        ], check=False)
+        # Move preferred to the front in place (it may not be listed yet)
+        try:
+            boot_order.remove(preferred)
+        except ValueError:
+            pass
+        boot_order.insert(0, preferred)
+        order_str = ",".join(boot_order)
+
+        res = self._run(["efibootmgr", "-o", order_str], check=False)
 
         if res.returncode == 0:
             self._log(f"Set EFI BootOrder with {preferred} first: {order_str}")
@@ -619,50 +701,70 @@ done
     def _install_de(self, s):
         de = s.de
         self._log(f"Installing {de['name']} packages: {de['packages']}")
-        self._run([
-            "arch-chroot", "/mnt",
-            "pacman", "-S", "--noconfirm"
-        ] + de["packages"])
+        script = f"pacman -S --noconfirm {shlex.join(de['packages'])}"
 
-        # Enable display manager now that packages are installed
+        # Enable the display manager in the same chroot session once the
+        # packages are in; a failure there is only a warning. The script
+        # echoes its own log line so it lands after pacman's output
         if de.get("dm"):
-            self._log(f"Enabling display manager: {de['dm']}")
-            result = self._run(
-                ["arch-chroot", "/mnt", "systemctl", "enable", de["dm"]],
-                check=False
+            dm = shlex.quote(de["dm"])
+            script += (
+                f" && echo {shlex.quote('Enabling display manager: ' + de['dm'])}"
+                f" && {{ systemctl enable {dm} || echo"
+                f" 'Warning: could not enable {de['dm']} — may need to enable manually'; }}"
             )
-            if result.returncode != 0:
-                self._log(f"Warning: could not enable {de['dm']} — may need to enable manually")
+
+        self._run(["arch-chroot", "/mnt", "bash", "-c", script],
+                  on_line=self._pacman_progress("de"))
 
     # ── Cleanup ───────────────────────────────────────────────────────────────
 
     def _cleanup(self):
+        if not os.path.ismount("/mnt"):
+            return
         self._log("Unmounting partitions")
         self._run(["umount", "-R", "/mnt"], check=False)
 
     # ── Subprocess helpers ────────────────────────────────────────────────────
 
-    def _run(self, cmd: list, check: bool = True):
-        self._log(f"$ {' '.join(cmd)}")
-        result = subprocess.run(
+    def _run(self, cmd: list, check: bool = True, input: str | None = None,
+             on_line=None) -> subprocess.CompletedProcess:
+        """
+        Run cmd, logging its output line by line as it arrives. Each line is
+        also passed to on_line if given. Only the last few lines are kept,
+        for the error message.
+        """
+        self._log_cmd(cmd)
+        cmd = resolve_cmd(cmd)
+        tail = collections.deque(maxlen=ERROR_TAIL_LINES)
+        with subprocess.Popen(
             cmd,
+            stdin=subprocess.PIPE if input is not None else None,
             stdout=subprocess.PIPE,
             stderr=subprocess.STDOUT,
-            text=True
-        )
-        if result.stdout:
-            for line in result.stdout.strip().splitlines():
+            text=True,
+            bufsize=1
+        ) as proc:
+            if input is not None:
+                proc.stdin.write(input)
+                proc.stdin.close()
+            for line in proc.stdout:
+                line = line.rstrip()
                 self._log(line)
-        if check and result.returncode != 0:
+                tail.append(line)
+                if on_line:
+                    on_line(line)
+        if check and proc.returncode != 0:
             raise RuntimeError(
-                f"Command failed (exit {result.returncode}):\n"
+                f"Command failed (exit {proc.returncode}):\n"
                 f"  {' '.join(cmd)}\n"
-                f"{result.stdout[-500:] if result.stdout else ''}"
+                + "\n".join(tail)[-ERROR_TAIL_CHARS:]
             )
-        return result
+        return subprocess.CompletedProcess(cmd, proc.returncode)
 
     def _run_output(self, cmd: list) -> str:
-        self._log(f"$ {' '.join(cmd)}")
+        self._log_cmd(cmd)
+        cmd = resolve_cmd(cmd)
         result = subprocess.run(
             cmd, capture_output=True, text=True
         )
@@ -675,6 +777,41 @@ done
     def _log(self, msg: str):
         self.log_line.emit(msg)
 
+    def _log_cmd(self, cmd: list):
+        # Joining a long pacman argv is wasted work if nothing shows the log
+        if self.receivers(self.log_line):
+            self.log_line.emit(f"$ {' '.join(cmd)}")
+
     def _progress(self, msg: str, pct: int):
+        self._last_pct  = pct
+        self._last_emit = time.monotonic()
         self.progress.emit(msg, pct)
         self._log(f"[{pct}%] {msg}")
+
+    def _step(self, step: str, msg: str):
+        """Announce the start of an install step."""
+        self._progress(msg, _STEP_START[step])
+
+    def _step_progress(self, step: str, fraction: float, msg: str):
+        """
+        Report progress within a step (fraction 0.0–1.0). Throttled so fast
+        loops don't flood the UI thread with signals; the final update of a
+        step (fraction >= 1.0) always goes through.
+        """
+        pct = _STEP_START[step] + int(STEP_WEIGHTS[step] * min(fraction, 1.0))
+        now = time.monotonic()
+        if fraction < 1.0 and (pct == self._last_pct
+                               or now - self._last_emit < PROGRESS_INTERVAL):
+            return
+        self._last_pct  = pct
+        self._last_emit = now
+        self.progress.emit(msg, pct)
+
+    def _pacman_progress(self, step: str):
+        """on_line callback that maps pacman's "(n/total) installing" lines onto step."""
+        def on_line(line: str):
+            m = _PACMAN_INSTALLING_RE.search(line)
+            if m:
+                self._step_progress(step, int(m.group(1)) / int(m.group(2)),
+                                    f"Installing {m.group(3).rstrip('.')}…")
+        return on_line
@@ -5,8 +5,14 @@ Dark Rose aesthetic: deep charcoal + hot pink accents.
 Animated fade transitions between screens.
 """
 
+import functools
+import importlib
+import os
+import socket
+import stat
 import sys
 import subprocess
+from dataclasses import dataclass, field
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QStackedWidget,
     QWidget, QVBoxLayout, QHBoxLayout,
@@ -16,25 +22,33 @@ from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer, QPropertyAnimation, QE
 from PyQt6.QtGui import QFont, QScreen, QLinearGradient, QColor, QPainter, QPalette
 
 from theme        import MASTER_STYLE, BG, BG2, BORDER, PINK, PINK2, ROSE, TEXT, TEXT2, TEXT3, fade_transition
-from wifi_screen  import WifiScreen
-from disk_screen  import DiskScreen
-from user_screen  import UserScreen
-from de_screen    import DEScreen
-from locale_screen import LocaleScreen
-from packages_screen  import PackagesScreen
-from hardware_screen  import HardwareScreen
-from system_screen   import SystemScreen
-from advanced_screen import AdvancedScreen
-from install_screen import InstallScreen
 
+# Gradient button used by the UEFI, Welcome and Done screens (built once)
+PRIMARY_BTN_CSS = f"""
+    QPushButton {{
+        background: qlineargradient(x1:0,y1:0,x2:1,y2:0,
+            stop:0 {ROSE}, stop:1 {PINK});
+        color: #12111a; border: none;
+        border-radius: 8px;
+        font-size: 14px; font-weight: bold;
+        letter-spacing: 1px;
+    }}
+    QPushButton:hover {{
+        background: qlineargradient(x1:0,y1:0,x2:1,y2:0,
+            stop:0 {PINK}, stop:1 {PINK2});
+    }}
+"""
 
 
 # ── UEFI check ────────────────────────────────────────────────────────────────
 
+@functools.lru_cache(maxsize=1)
 def is_uefi() -> bool:
-    """Returns True if system booted in UEFI mode."""
-    import os
-    return os.path.isdir("/sys/firmware/efi")
+    """Returns True if system booted in UEFI mode. Cached; it can't change."""
+    try:
+        return stat.S_ISDIR(os.stat("/sys/firmware/efi").st_mode)
+    except OSError:
+        return False
 
 
 class UEFIBlockScreen(QWidget):
@@ -79,38 +93,12 @@ class UEFIBlockScreen(QWidget):
 
         exit_btn = QPushButton("Exit Installer")
         exit_btn.setObjectName("secondary")
-        exit_btn.setStyleSheet(f"""
-            QPushButton {{
-                background: qlineargradient(x1:0,y1:0,x2:1,y2:0,
-                    stop:0 {ROSE}, stop:1 {PINK});
-                color: #12111a; border: none;
-                border-radius: 8px;
-                font-size: 14px; font-weight: bold;
-                letter-spacing: 1px;
-            }}
-            QPushButton:hover {{
-                background: qlineargradient(x1:0,y1:0,x2:1,y2:0,
-                    stop:0 {PINK}, stop:1 {PINK2});
-            }}
-        """)
+        exit_btn.setStyleSheet(PRIMARY_BTN_CSS)
         exit_btn.clicked.connect(lambda: QApplication.quit())
 
         continue_btn = QPushButton("Continue Anyway →")
         continue_btn.setObjectName("primary")
-        continue_btn.setStyleSheet(f"""
-            QPushButton {{
-                background: qlineargradient(x1:0,y1:0,x2:1,y2:0,
-                    stop:0 {ROSE}, stop:1 {PINK});
-                color: #12111a; border: none;
-                border-radius: 8px;
-                font-size: 14px; font-weight: bold;
-                letter-spacing: 1px;
-            }}
-            QPushButton:hover {{
-                background: qlineargradient(x1:0,y1:0,x2:1,y2:0,
-                    stop:0 {PINK}, stop:1 {PINK2});
-            }}
-        """)
+        continue_btn.setStyleSheet(PRIMARY_BTN_CSS)
         continue_btn.clicked.connect(self.proceed.emit)
 
         btn_row.addStretch()
@@ -126,47 +114,64 @@ class UEFIBlockScreen(QWidget):
 class NetCheckWorker(QThread):
     has_internet = pyqtSignal(bool)
     def run(self):
+        # A TCP connect to a public DNS resolver needs no root and no fork
         try:
-            r = subprocess.run(["ping","-c","1","-W","2","8.8.8.8"],
-                               capture_output=True, timeout=5)
-            self.has_internet.emit(r.returncode == 0)
-        except Exception:
+            socket.create_connection(("1.1.1.1", 53), timeout=1.5).close()
+            self.has_internet.emit(True)
+        except OSError:
             self.has_internet.emit(False)
 
 
 # ── Shared state ──────────────────────────────────────────────────────────────
 
+@dataclass(slots=True)
 class InstallState:
-    def __init__(self):
-        self.wifi_ssid      = ""
-        self.locale         = "en_US.UTF-8"
-        self.timezone       = "UTC"
-        self.keymap         = "us"
-        self.user_packages   = []
-        self.cpu_packages    = []
-        self.gpu_packages    = []
-        self.system_packages = []
-        self.system_services = []
-        self.kernel_choice   = "linux"
-        self.advanced_packages = []
-        self.disk           = {}
-        self.efi_partition  = {}
-        self.arch_size_gb   = 40.0
-        self.install_mode   = "dualboot"
-        self.hostname       = ""
-        self.username       = ""
-        self.password       = ""
-        self.de             = {}
-        self.root_partition = ""
-        self.efi_mount      = ""
+    wifi_ssid:         str   = ""
+    locale:            str   = "en_US.UTF-8"
+    timezone:          str   = "UTC"
+    keymap:            str   = "us"
+    user_packages:     list  = field(default_factory=list)
+    cpu_packages:      list  = field(default_factory=list)
+    gpu_packages:      list  = field(default_factory=list)
+    system_packages:   list  = field(default_factory=list)
+    system_services:   list  = field(default_factory=list)
+    kernel_choice:     str   = "linux"
+    advanced_packages: list  = field(default_factory=list)
+    disk:              dict  = field(default_factory=dict)
+    efi_partition:     dict  = field(default_factory=dict)
+    windows_partition: dict  = field(default_factory=dict)
+    arch_size_gb:      float = 40.0
+    install_mode:      str   = "dualboot"
+    hostname:          str   = ""
+    username:          str   = ""
+    password:          str   = ""
+    de:                dict  = field(default_factory=dict)
+    root_partition:    str   = ""
+    efi_mount:         str   = ""
 
 
 # ── Sidebar ───────────────────────────────────────────────────────────────────
 
-STEPS = ["Welcome", "Language", "Wi-Fi", "Disk Setup",
-         "User Setup", "Desktop", "Hardware", "Packages", "Advanced", "System", "Install", "Done"]
+STEPS = ("Welcome", "Language", "Wi-Fi", "Disk Setup",
+         "User Setup", "Desktop", "Hardware", "Packages", "Advanced", "System", "Install", "Done")
 
 class Sidebar(QFrame):
+    # Step label styles, built once: current / already done / still ahead
+    STYLE_ACTIVE = (
+        f"font-size: 12px; font-weight: bold; color: {PINK};"
+        f"background-color: #2d1a24; padding: 8px 8px;"
+        f"border-radius: 7px; border-left: 3px solid {PINK};"
+    )
+    STYLE_PAST = (
+        f"font-size: 12px; color: {TEXT2}; padding: 8px 8px;"
+        f"border-radius: 7px; background: transparent;"
+        f"border-left: 3px solid #3d2a34;"
+    )
+    STYLE_FUTURE = (
+        f"font-size: 12px; color: {TEXT3}; padding: 8px 8px;"
+        f"border-radius: 7px; background: transparent;"
+    )
+
     def __init__(self):
         super().__init__()
         self.setFixedWidth(200)
@@ -194,11 +199,14 @@ class Sidebar(QFrame):
         v.addSpacing(32)
 
         self._labels = []
-        for i, step in enumerate(STEPS):
+        for step in STEPS:
             lbl = QLabel(f"  {step}")
-            lbl.setStyleSheet(f"font-size: 12px; color: {TEXT3}; padding: 8px 8px; border-radius: 7px; background: transparent;")
+            lbl.setStyleSheet(self.STYLE_FUTURE)
             v.addWidget(lbl)
             self._labels.append(lbl)
+        # Style currently applied to each label, so set_step can skip the
+        # ones that don't change (setStyleSheet re-parses every time)
+        self._applied = [self.STYLE_FUTURE] * len(self._labels)
 
         v.addStretch()
 
@@ -210,22 +218,14 @@ class Sidebar(QFrame):
     def set_step(self, index: int):
         for i, lbl in enumerate(self._labels):
             if i == index:
-                lbl.setStyleSheet(
-                    f"font-size: 12px; font-weight: bold; color: {PINK};"
-                    f"background-color: #2d1a24; padding: 8px 8px;"
-                    f"border-radius: 7px; border-left: 3px solid {PINK};"
-                )
+                style = self.STYLE_ACTIVE
             elif i < index:
-                lbl.setStyleSheet(
-                    f"font-size: 12px; color: {TEXT2}; padding: 8px 8px;"
-                    f"border-radius: 7px; background: transparent;"
-                    f"border-left: 3px solid #3d2a34;"
-                )
+                style = self.STYLE_PAST
             else:
-                lbl.setStyleSheet(
-                    f"font-size: 12px; color: {TEXT3}; padding: 8px 8px;"
-                    f"border-radius: 7px; background: transparent;"
-                )
+                style = self.STYLE_FUTURE
+            if self._applied[i] is not style:
+                lbl.setStyleSheet(style)
+                self._applied[i] = style
 
 
 # ── Welcome screen ────────────────────────────────────────────────────────────
@@ -274,20 +274,7 @@ class WelcomeScreen(QWidget):
         btn = QPushButton("Get Started →")
         btn.setFixedWidth(220)
         btn.setFixedHeight(44)
-        btn.setStyleSheet(f"""
-            QPushButton {{
-                background: qlineargradient(x1:0,y1:0,x2:1,y2:0,
-                    stop:0 {ROSE}, stop:1 {PINK});
-                color: #12111a; border: none;
-                border-radius: 8px;
-                font-size: 14px; font-weight: bold;
-                letter-spacing: 1px;
-            }}
-            QPushButton:hover {{
-                background: qlineargradient(x1:0,y1:0,x2:1,y2:0,
-                    stop:0 {PINK}, stop:1 {PINK2});
-            }}
-        """)
+        btn.setStyleSheet(PRIMARY_BTN_CSS)
         btn.clicked.connect(self.proceed.emit)
 
         v.addWidget(glyph)
@@ -328,20 +315,7 @@ class DoneScreen(QWidget):
         btn.setObjectName("primary")
         btn.setFixedWidth(200)
         btn.setFixedHeight(44)
-        btn.setStyleSheet(f"""
-            QPushButton {{
-                background: qlineargradient(x1:0,y1:0,x2:1,y2:0,
-                    stop:0 {ROSE}, stop:1 {PINK});
-                color: #12111a; border: none;
-                border-radius: 8px;
-                font-size: 14px; font-weight: bold;
-                letter-spacing: 1px;
-            }}
-            QPushButton:hover {{
-                background: qlineargradient(x1:0,y1:0,x2:1,y2:0,
-                    stop:0 {PINK}, stop:1 {PINK2});
-            }}
-        """)
+        btn.setStyleSheet(PRIMARY_BTN_CSS)
         btn.clicked.connect(lambda: subprocess.run(["reboot"]))
 
         v.addWidget(glyph)
@@ -354,10 +328,47 @@ class DoneScreen(QWidget):
 # ── Main window ───────────────────────────────────────────────────────────────
 
 class MainWindow(QMainWindow):
+    # Screens whose confirmed signal just stores its arguments on the state:
+    # screen attribute -> (InstallState fields in signal order, next index)
+    CONFIRM_STEPS = {
+        "disk":     (("disk", "efi_partition", "arch_size_gb", "install_mode"), 5),
+        "user":     (("hostname", "username", "password"), 6),
+        "de":       (("de",), 7),
+        "hardware": (("cpu_packages", "gpu_packages"), 8),
+        "packages": (("user_packages",), 9),
+        "advanced": (("kernel_choice", "advanced_packages"), 10),
+    }
+
+    FADE_MS = 200
+
+    # Stack index -> (MainWindow attribute, module, class) for screens that
+    # are only imported and built the first time they're navigated to
+    LAZY_SCREENS = {
+        2:  ("locale",         "locale_screen",   "LocaleScreen"),
+        3:  ("wifi",           "wifi_screen",     "WifiScreen"),
+        4:  ("disk",           "disk_screen",     "DiskScreen"),
+        5:  ("user",           "user_screen",     "UserScreen"),
+        6:  ("de",             "de_screen",       "DEScreen"),
+        7:  ("hardware",       "hardware_screen", "HardwareScreen"),
+        8:  ("packages",       "packages_screen", "PackagesScreen"),
+        9:  ("advanced",       "advanced_screen", "AdvancedScreen"),
+        10: ("system",         "system_screen",   "SystemScreen"),
+        11: ("install_screen", "install_screen",  "InstallScreen"),
+    }
+
+    # Remaining screen signals with a dedicated handler: attr -> (signal, slot)
+    SCREEN_SLOTS = {
+        "locale":         ("confirmed", "_on_locale_confirmed"),
+        "wifi":           ("connected", "_on_wifi_connected"),
+        "system":         ("confirmed", "_on_system_confirmed"),
+        "install_screen": ("finished",  "_on_install_finished"),
+    }
+
     def __init__(self):
         super().__init__()
         self.state = InstallState()
         self._already_online = False
+        self._fading = False
         self.setWindowTitle("Archey")
         self.setStyleSheet(MASTER_STYLE)
         self._build_ui()
@@ -391,78 +402,65 @@ class MainWindow(QMainWindow):
         self.welcome.proceed.connect(self._after_welcome)
         self.stack.addWidget(self.welcome)
 
-        # 1 — Language / Timezone
-        self.locale = LocaleScreen()
-        self.locale.confirmed.connect(self._on_locale_confirmed)
-        self.locale.back.connect(lambda: self._goto(1))
-        self.stack.addWidget(self.locale)
-
-        # 2 — Wi-Fi
-        self.wifi = WifiScreen()
-        self.wifi.connected.connect(self._on_wifi_connected)
-        self.stack.addWidget(self.wifi)
-
-        # 3 — Disk
-        self.disk = DiskScreen()
-        self.disk.confirmed.connect(self._on_disk_confirmed)
-        self.disk.back.connect(lambda: self._goto(3))
-        self.stack.addWidget(self.disk)
-
-        # 4 — User
-        self.user = UserScreen()
-        self.user.confirmed.connect(self._on_user_confirmed)
-        self.user.back.connect(lambda: self._goto(4))
-        self.stack.addWidget(self.user)
-
-        # 5 — Desktop
-        self.de = DEScreen()
-        self.de.confirmed.connect(self._on_de_confirmed)
-        self.de.back.connect(lambda: self._goto(5))
-        self.stack.addWidget(self.de)
-
-        # 6 — Hardware (CPU + GPU)
-        self.hardware = HardwareScreen()
-        self.hardware.confirmed.connect(self._on_hardware_confirmed)
-        self.hardware.back.connect(lambda: self._goto(6))
-        self.stack.addWidget(self.hardware)
-
-        # 7 — Package search
-        self.packages = PackagesScreen()
-        self.packages.confirmed.connect(self._on_packages_confirmed)
-        self.packages.back.connect(lambda: self._goto(7))
-        self.stack.addWidget(self.packages)
-
-        # 8 — Advanced options (kernel + optional extras)
-        self.advanced = AdvancedScreen()
-        self.advanced.confirmed.connect(self._on_advanced_confirmed)
-        self.advanced.back.connect(lambda: self._goto(8))
-        self.stack.addWidget(self.advanced)
-
-        # 9 — System setup (audio / bluetooth / printing)
-        self.system = SystemScreen()
-        self.system.confirmed.connect(self._on_system_confirmed)
-        self.system.back.connect(lambda: self._goto(9))
-        self.stack.addWidget(self.system)
-
-        # 10 — Install
-        self.install_screen = InstallScreen()
-        self.install_screen.finished.connect(lambda: self._goto(12))
-        self.stack.addWidget(self.install_screen)
+        # 2–11 — wizard screens, imported and built on first visit (_screen)
+        self._built_screens = {}
+        for _ in self.LAZY_SCREENS:
+            self.stack.addWidget(QWidget())
 
         # 11 — Done
         self.done = DoneScreen()
         self.stack.addWidget(self.done)
 
+    def _screen(self, index: int) -> QWidget:
+        """Return the screen at a stack index, importing and building it on first use."""
+        if index not in self.LAZY_SCREENS:
+            return self.stack.widget(index)
+        if index in self._built_screens:
+            return self._built_screens[index]
+        attr, module, cls = self.LAZY_SCREENS[index]
+
+        screen = getattr(importlib.import_module(module), cls)()
+        setattr(self, attr, screen)
+        self._built_screens[index] = screen
+
+        # Swap the placeholder for the real screen at the same index
+        placeholder = self.stack.widget(index)
+        self.stack.insertWidget(index, screen)
+        self.stack.removeWidget(placeholder)
+        placeholder.deleteLater()
+
+        if hasattr(screen, "back"):
+            screen.back.connect(functools.partial(self._goto, index - 1))
+        if attr in self.CONFIRM_STEPS:
+            fields, next_index = self.CONFIRM_STEPS[attr]
+            screen.confirmed.connect(
+                functools.partial(self._on_confirmed, fields, next_index))
+        if attr in self.SCREEN_SLOTS:
+            signal, slot = self.SCREEN_SLOTS[attr]
+            getattr(screen, signal).connect(getattr(self, slot))
+        return screen
+
     # ── Navigation with fade ──────────────────────────────────────────────────
 
     def _goto(self, index: int):
+        self._screen(index)
         old = self.stack.currentWidget()
         self.stack.setCurrentIndex(index)
         new = self.stack.currentWidget()
         if old and old is not new:
-            fade_transition(old, new, duration=200)
+            if self._fading:
+                # Rapid navigation: switch instantly instead of stacking up
+                # animations, and drop any half-finished fade on the new screen
+                new.setGraphicsEffect(None)
+            else:
+                self._fading = True
+                fade_transition(old, new, duration=self.FADE_MS)
+                QTimer.singleShot(self.FADE_MS, self._end_fade)
         self.sidebar.set_step(max(0, index - 1))  # offset for uefi block at index 0
 
+    def _end_fade(self):
+        self._fading = False
+
     # ── Flow logic ────────────────────────────────────────────────────────────
 
     def _after_welcome(self):
@@ -481,14 +479,15 @@ class MainWindow(QMainWindow):
         self._goto(4)
 
     def _presync_db(self):
-        """Init keyring, refresh mirrors, then sync pacman db."""
+        """Init keyring and refresh mirrors side by side, then sync pacman db."""
         try:
+            # Keyring setup and mirror ranking don't depend on each other;
+            # only the final -Sy needs both
             subprocess.Popen(
                 ["/bin/sh", "-c",
-                 "pacman-key --init"
-                 " && pacman-key --populate archlinux"
-                 " && reflector --latest 20 --sort rate --save /etc/pacman.d/mirrorlist"
-                 " && pacman -Sy --noconfirm"],
+                 "pacman-key --init && pacman-key --populate archlinux & keys=$!;"
+                 " reflector --latest 20 --sort rate --save /etc/pacman.d/mirrorlist & mirrors=$!;"
+                 " wait $keys && wait $mirrors && pacman -Sy --noconfirm"],
                 stdout=subprocess.DEVNULL,
                 stderr=subprocess.DEVNULL
             )
@@ -506,36 +505,10 @@ class MainWindow(QMainWindow):
         else:
             self._goto(3)
 
-    def _on_disk_confirmed(self, disk, efi, gb, mode):
-        self.state.disk         = disk
-        self.state.efi_partition = efi
-        self.state.arch_size_gb = gb
-        self.state.install_mode = mode
-        self._goto(5)
-
-    def _on_user_confirmed(self, hostname, username, password):
-        self.state.hostname = hostname
-        self.state.username = username
-        self.state.password = password
-        self._goto(6)
-
-    def _on_de_confirmed(self, de):
-        self.state.de = de
-        self._goto(7)
-
-    def _on_hardware_confirmed(self, cpu_pkgs: list, gpu_pkgs: list):
-        self.state.cpu_packages = cpu_pkgs
-        self.state.gpu_packages = gpu_pkgs
-        self._goto(8)
-
-    def _on_packages_confirmed(self, packages: list):
-        self.state.user_packages = packages
-        self._goto(9)
-
-    def _on_advanced_confirmed(self, kernel_choice: str, extra_packages: list):
-        self.state.kernel_choice = kernel_choice
-        self.state.advanced_packages = extra_packages
-        self._goto(10)
+    def _on_confirmed(self, fields: tuple, next_index: int, *values):
+        for attr, value in zip(fields, values):
+            setattr(self.state, attr, value)
+        self._goto(next_index)
 
     def _on_system_confirmed(self, packages: list, services: list):
         self.state.system_packages = packages
@@ -543,6 +516,9 @@ class MainWindow(QMainWindow):
         self._goto(11)
         self.install_screen.start(self.state)
 
+    def _on_install_finished(self):
+        self._goto(12)
+
 
 # ── Entry point ───────────────────────────────────────────────────────────────
 
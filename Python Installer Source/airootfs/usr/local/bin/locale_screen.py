@@ -6,16 +6,16 @@ Archey — Language, Timezone & Keyboard layout screen.
 import sys
 from PyQt6.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout,
-    QLabel, QPushButton, QListWidget, QListWidgetItem,
+    QLabel, QPushButton, QListWidget,
     QLineEdit, QTabWidget
 )
-from PyQt6.QtCore import Qt, pyqtSignal
-from PyQt6.QtWidgets import QAbstractItemView
+from PyQt6.QtCore import QTimer, pyqtSignal
+from PyQt6.QtWidgets import QAbstractItemView, QListView
 from theme import MASTER_STYLE, PINK, TEXT, TEXT2, TEXT3, BG2, BORDER, GREEN
 
 # ── Data ──────────────────────────────────────────────────────────────────────
 
-TIMEZONES = [
+TIMEZONES = (
     "UTC",
     "America/New_York","America/Chicago","America/Denver","America/Los_Angeles",
     "America/Toronto","America/Vancouver","America/Sao_Paulo","America/Mexico_City",
@@ -32,9 +32,9 @@ TIMEZONES = [
     "Pacific/Auckland","Pacific/Honolulu","Pacific/Fiji",
     "Africa/Cairo","Africa/Johannesburg","Africa/Lagos","Africa/Nairobi",
     "Africa/Casablanca","Africa/Accra",
-]
+)
 
-LOCALES = [
+LOCALES = (
     ("en_US.UTF-8", "English (United States)"),
     ("en_GB.UTF-8", "English (United Kingdom)"),
     ("en_AU.UTF-8", "English (Australia)"),
@@ -81,9 +81,9 @@ LOCALES = [
     ("vi_VN.UTF-8", "Tiếng Việt (Việt Nam)"),
     ("id_ID.UTF-8", "Bahasa Indonesia"),
     ("ms_MY.UTF-8", "Bahasa Melayu (Malaysia)"),
-]
+)
 
-KEYMAPS = [
+KEYMAPS = (
     ("us",          "English (US)"),
     ("us-acentos",  "English (US, intl. with dead keys)"),
     ("gb",          "English (UK)"),
@@ -126,13 +126,58 @@ KEYMAPS = [
     ("workman",     "Workman"),
     ("azerty",      "AZERTY"),
     ("qwertz",      "QWERTZ"),
-]
+)
+
+
+def search_index(items):
+    """(code_lower, label_lower, display, code) for each (code, label) item."""
+    return tuple((code.lower(), label.lower(), f"{label}  [{code}]", code)
+                 for code, label in items)
+
+
+def bigram_index(index) -> dict:
+    """Map every two-character substring of an entry's code/label to its rows."""
+    grams = {}
+    for row, (code_l, label_l, _, _) in enumerate(index):
+        for text in (code_l, label_l):
+            for i in range(len(text) - 1):
+                grams.setdefault(text[i:i + 2], set()).add(row)
+    return grams
+
+
+def search_rows(index, grams, q, within=None) -> set:
+    """
+    Rows of index whose code or label contains q (q already lower-cased).
+    within, if given, is a set of rows already known to hold every match.
+    """
+    if within is not None:
+        rows = within
+    elif len(q) < 2:
+        rows = range(len(index))
+    else:
+        # Every bigram of q must occur in a match; intersect, then confirm
+        rows = set.intersection(*(grams.get(q[i:i + 2], set())
+                                  for i in range(len(q) - 1)))
+    return {row for row in rows
+            if q in index[row][0] or q in index[row][1]}
+
+
+# Built once so filtering never re-lowercases or re-formats an entry
+_LOCALES_IDX   = search_index(LOCALES)
+_TIMEZONES_IDX = search_index((tz, tz) for tz in TIMEZONES)
+_KEYMAPS_IDX   = search_index(KEYMAPS)
 
 
 # ── Searchable list helper ────────────────────────────────────────────────────
 
-def make_search_list(placeholder, items, on_select):
-    """Returns (container_widget, list_widget, populate_fn)."""
+SEARCH_DEBOUNCE_MS = 100
+
+def make_search_list(placeholder, index, on_select):
+    """
+    Returns (container_widget, list_widget, populate_fn).
+    index is a search_index() of the (code, label) items to show. The rows
+    are created once; populate(query) only hides and shows them.
+    """
     container = QWidget()
     container.setStyleSheet("background: transparent;")
     v = QVBoxLayout(container)
@@ -145,21 +190,63 @@ def make_search_list(placeholder, items, on_select):
 
     lst = QListWidget()
     lst.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+    # Every row is one line of text: skip per-row size hints and lay out in
+    # batches when filtering shows rows again
+    lst.setUniformItemSizes(True)
+    lst.setLayoutMode(QListView.LayoutMode.Batched)
+    lst.setBatchSize(256)
+    lst.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
     lst.itemSelectionChanged.connect(lambda: on_select(lst))
     v.addWidget(lst)
 
+    # Build every row in one batch up front
+    lst.addItems([display for _, _, display, _ in index])
+    # Rows never move, so these stay valid however the list is filtered
+    lst._row_codes   = [code for _, _, _, code in index]
+    lst._code_to_row = {code: row for row, code in enumerate(lst._row_codes)}
+    grams  = None   # built on the first real search, not while the screen opens
+    hidden = set()
+    every  = set(range(len(index)))
+    last_q, last_hits = "", every
+
     def populate(query=""):
-        lst.clear()
+        nonlocal grams, last_q, last_hits
         q = query.lower()
-        for code, label in items:
-            if q and q not in code.lower() and q not in label.lower():
-                continue
-            item = QListWidgetItem(f"{label}  [{code}]")
-            item.setData(Qt.ItemDataRole.UserRole, code)
-            lst.addItem(item)
-
-    search.textChanged.connect(populate)
-    populate()
+        if not q:
+            # Cleared box: no matching at all, just reveal whatever is hidden
+            last_q, last_hits = "", every
+            if not hidden:
+                return
+            now_hidden = set()
+        else:
+            if grams is None:
+                grams = bigram_index(index)
+            # Extending the previous query can only shrink its hits, so
+            # rescan just those instead of the whole list
+            within = last_hits if last_q and q.startswith(last_q) else None
+            hits = search_rows(index, grams, q, within)
+            last_q, last_hits = q, hits
+            now_hidden = every - hits
+
+        # Only touch rows whose visibility actually changes; repaint once
+        lst.setUpdatesEnabled(False)
+        try:
+            for row in now_hidden - hidden:
+                lst.setRowHidden(row, True)
+            for row in hidden - now_hidden:
+                lst.setRowHidden(row, False)
+        finally:
+            lst.setUpdatesEnabled(True)
+        hidden.clear()
+        hidden.update(now_hidden)
+
+    # Debounce typing: only the last keystroke in a burst refilters.
+    # start() on the running single-shot timer restarts it
+    debounce = QTimer(container)
+    debounce.setSingleShot(True)
+    debounce.setInterval(SEARCH_DEBOUNCE_MS)
+    debounce.timeout.connect(lambda: populate(search.text()))
+    search.textChanged.connect(lambda _text: debounce.start())
     return container, lst, populate
 
 
@@ -214,20 +301,19 @@ class LocaleScreen(QWidget):
 
         # ── Tab 1: Locale ──────────────────────────────────────────────────
         locale_tab, self.locale_list, _ = make_search_list(
-            "Search language…", LOCALES, self._on_locale_select
+            "Search language…", _LOCALES_IDX, self._on_locale_select
         )
         tabs.addTab(locale_tab, "🌐  Language")
 
         # ── Tab 2: Timezone ────────────────────────────────────────────────
-        tz_items = [(tz, tz) for tz in TIMEZONES]
         tz_tab, self.tz_list, _ = make_search_list(
-            "Search timezone…", tz_items, self._on_tz_select
+            "Search timezone…", _TIMEZONES_IDX, self._on_tz_select
         )
         tabs.addTab(tz_tab, "🕐  Timezone")
 
         # ── Tab 3: Keyboard ────────────────────────────────────────────────
         kb_tab, self.kb_list, _ = make_search_list(
-            "Search keyboard layout…", KEYMAPS, self._on_kb_select
+            "Search keyboard layout…", _KEYMAPS_IDX, self._on_kb_select
         )
         tabs.addTab(kb_tab, "⌨️  Keyboard")
 
@@ -263,30 +349,29 @@ class LocaleScreen(QWidget):
     # ── Callbacks ─────────────────────────────────────────────────────────────
 
     def _on_locale_select(self, lst):
-        items = lst.selectedItems()
-        if items:
-            self._sel_locale = items[0].data(Qt.ItemDataRole.UserRole)
+        row = lst.currentRow()
+        if row >= 0:
+            self._sel_locale = lst._row_codes[row]
             self._update_summary()
 
     def _on_tz_select(self, lst):
-        items = lst.selectedItems()
-        if items:
-            self._sel_tz = items[0].data(Qt.ItemDataRole.UserRole)
+        row = lst.currentRow()
+        if row >= 0:
+            self._sel_tz = lst._row_codes[row]
             self._update_summary()
 
     def _on_kb_select(self, lst):
-        items = lst.selectedItems()
-        if items:
-            self._sel_keymap = items[0].data(Qt.ItemDataRole.UserRole)
+        row = lst.currentRow()
+        if row >= 0:
+            self._sel_keymap = lst._row_codes[row]
             self._update_summary()
 
     def _select_default(self, lst, value):
-        for i in range(lst.count()):
-            item = lst.item(i)
-            if item.data(Qt.ItemDataRole.UserRole) == value:
-                lst.setCurrentItem(item)
-                lst.scrollToItem(item)
-                break
+        row = lst._code_to_row.get(value)
+        if row is not None:
+            item = lst.item(row)
+            lst.setCurrentItem(item)
+            lst.scrollToItem(item)
 
     def _update_summary(self):
         self.summary.setText(
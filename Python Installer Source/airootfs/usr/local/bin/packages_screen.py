@@ -4,8 +4,13 @@ Archey — Package search screen.
 Syncs pacman db then searches via pacman -Ss.
 """
 
+import collections
+import os
+import re
 import sys
 import subprocess
+import threading
+import time
 from PyQt6.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout,
     QLabel, QPushButton, QLineEdit, QListWidget,
@@ -31,6 +36,15 @@ Server = https://mirrors.ircam.fr/pub/archlinux/$repo/os/$arch
 Server = https://mirror.nl.leaseweb.net/archlinux/$repo/os/$arch
 """
 
+SYNC_TIMEOUT = 180   # seconds for pacman -Sy
+
+# pacman-key --init leaves a public keyring here (keybox on newer GnuPG)
+KEYRING_FILES = ("/etc/pacman.d/gnupg/pubring.gpg", "/etc/pacman.d/gnupg/pubring.kbx")
+
+# Names a repo in piped pacman -Sy output: " core downloading..." / " core is up to date"
+_SYNC_REPO_RE = re.compile(r"^\s*([\w-]+) (?:downloading|is up to date)")
+
+
 class SyncWorker(QThread):
     done   = pyqtSignal()
     error  = pyqtSignal(str)
@@ -67,11 +81,7 @@ class SyncWorker(QThread):
         # Step 3: Init keyring only if needed
         self.status.emit("Checking keyring…")
         try:
-            result = subprocess.run(
-                ["pacman-key", "--list-keys"],
-                capture_output=True, timeout=10
-            )
-            if result.returncode != 0:
+            if not any(os.path.exists(f) for f in KEYRING_FILES):
                 self.status.emit("Initialising keyring (this may take a minute)…")
                 subprocess.run(["pacman-key", "--init"],
                                capture_output=True, timeout=120)
@@ -80,19 +90,34 @@ class SyncWorker(QThread):
         except Exception:
             pass
 
-        # Step 4: Sync databases
+        # Step 4: Sync databases, reporting each repo as pacman reaches it
         self.status.emit("Syncing package databases…")
         try:
-            result = subprocess.run(
+            proc = subprocess.Popen(
                 ["pacman", "-Sy", "--noconfirm"],
-                capture_output=True, text=True, timeout=180
+                stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                text=True, bufsize=1
             )
-            if result.returncode != 0:
-                self.error.emit(result.stdout + result.stderr)
+            started  = time.monotonic()
+            watchdog = threading.Timer(SYNC_TIMEOUT, proc.kill)
+            watchdog.start()
+            output = []
+            try:
+                with proc.stdout:
+                    for line in proc.stdout:
+                        output.append(line)
+                        m = _SYNC_REPO_RE.search(line)
+                        if m:
+                            self.status.emit(f"Syncing {m[1]}…")
+                rc = proc.wait()
+            finally:
+                watchdog.cancel()
+            if rc != 0 and time.monotonic() - started >= SYNC_TIMEOUT:
+                self.error.emit("Database sync timed out — check your internet connection.")
+            elif rc != 0:
+                self.error.emit("".join(output))
             else:
                 self.done.emit()
-        except subprocess.TimeoutExpired:
-            self.error.emit("Database sync timed out — check your internet connection.")
         except FileNotFoundError:
             self.error.emit("pacman not found.")
         except Exception as e:
@@ -101,57 +126,106 @@ class SyncWorker(QThread):
 
 # ── Search worker ─────────────────────────────────────────────────────────────
 
+SEARCH_LIMIT   = 100   # results shown per query
+SEARCH_BATCH   = 50    # results handed to the list at a time while pacman runs
+SEARCH_TIMEOUT = 20    # seconds
+SEARCH_DEBOUNCE_MS = 600   # quiet time after the last keystroke before searching
+SEARCH_CACHE_SIZE  = 16    # complete result sets kept for narrowing searches
+
+# pacman treats the query as regexes (one per word); only a single plain term
+# can be narrowed in Python
+_REGEX_CHARS = frozenset(".^$*+?{}[]\\|() \t")
+
+# pacman -Ss header line: "repo/name version [groups] [installed]"
+_PKG_HEADER_RE = re.compile(r"([^/\s]+)/(\S+)\s+(\S+)(.*)")
+
+
 class SearchWorker(QThread):
-    results_ready  = pyqtSignal(list)
+    batch_ready    = pyqtSignal(list)   # packages as they are parsed, in chunks
+    results_ready  = pyqtSignal(list)   # every package, once the search is done
     error_occurred = pyqtSignal(str)
 
     def __init__(self, query: str):
         super().__init__()
-        self.query = query
+        self.query    = query
+        self._proc   = None
+        self._cancel = threading.Event()
+
+    def stop(self):
+        """Kill the running pacman so run() returns promptly and emits nothing."""
+        self._cancel.set()
+        if self._proc and self._proc.poll() is None:
+            self._proc.kill()
 
     def run(self):
         try:
-            result = subprocess.run(
+            self._proc = subprocess.Popen(
                 ["pacman", "-Ss", self.query],
-                capture_output=True, text=True, timeout=20
+                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                text=True, bufsize=1
             )
-            # pacman -Ss returns exit 1 if no results — that's fine
-            self.results_ready.emit(self._parse(result.stdout))
-        except subprocess.TimeoutExpired:
-            self.error_occurred.emit("Search timed out.")
         except FileNotFoundError:
             self.error_occurred.emit("pacman not found.")
+            return
         except Exception as e:
             self.error_occurred.emit(str(e))
+            return
 
-    def _parse(self, raw: str) -> list:
-        packages = []
-        lines = raw.splitlines()
-        i = 0
-        while i < len(lines):
-            line = lines[i]
+        started  = time.monotonic()
+        watchdog = threading.Timer(SEARCH_TIMEOUT, self._proc.kill)
+        watchdog.start()
+        packages, batch = [], []
+        try:
+            with self._proc.stdout:
+                for pkg in self._parse(self._proc.stdout):
+                    if self._cancel.is_set():
+                        break
+                    packages.append(pkg)
+                    batch.append(pkg)
+                    if len(batch) == SEARCH_BATCH:
+                        self.batch_ready.emit(batch)
+                        batch = []
+                    if len(packages) == SEARCH_LIMIT:
+                        break
+        finally:
+            watchdog.cancel()
+            if self._proc.poll() is None:
+                self._proc.kill()   # hit the limit; don't wait for the rest
+            self._proc.wait()
+
+        if self._cancel.is_set():
+            return
+        if batch:
+            self.batch_ready.emit(batch)
+        if len(packages) < SEARCH_LIMIT and time.monotonic() - started >= SEARCH_TIMEOUT:
+            self.error_occurred.emit("Search timed out.")
+            return
+        # pacman -Ss returns exit 1 if no results — that's fine
+        self.results_ready.emit(packages)
+
+    @staticmethod
+    def _parse(lines):
+        """Yield a package dict per result as pacman -Ss prints it."""
+        pkg = None
+        for line in lines:
+            line = line.rstrip("\n")
             # Package header line is NOT indented and contains repo/name
-            if line and not line[0].isspace() and "/" in line:
-                parts = line.split()
-                if not parts:
-                    i += 1
-                    continue
-                repo_name = parts[0]
-                version   = parts[1] if len(parts) > 1 else ""
-                installed = len(parts) > 2 and "[installed]" in line
-                repo, _, name = repo_name.partition("/")
-                desc = ""
+            m = _PKG_HEADER_RE.match(line)
+            if m:
+                if pkg:
+                    yield pkg
+                repo, name, version, rest = m.groups()
+                pkg = {
+                    "name": name, "repo": repo, "version": version,
+                    "desc": "", "installed": "[installed]" in rest,
+                }
+            elif pkg and line[:1].isspace():
                 # Description is next line, indented with spaces
-                if i + 1 < len(lines) and lines[i + 1] and lines[i + 1][0].isspace():
-                    desc = lines[i + 1].strip()
-                    i += 1
-                packages.append({
-                    "name": name, "repo": repo,
-                    "version": version, "desc": desc,
-                    "installed": installed,
-                })
-            i += 1
-        return packages[:100]
+                pkg["desc"] = line.strip()
+                yield pkg
+                pkg = None
+        if pkg:
+            yield pkg
 
 
 # ── Main screen ───────────────────────────────────────────────────────────────
@@ -166,6 +240,7 @@ class PackagesScreen(QWidget):
         self._selected: dict[str, dict] = {}
         self._search_worker = None
         self._sync_worker   = None
+        self._result_cache: collections.OrderedDict[str, list] = collections.OrderedDict()
         self._db_synced     = False
         self._search_timer  = QTimer()
         self._search_timer.setSingleShot(True)
@@ -343,7 +418,7 @@ class PackagesScreen(QWidget):
             self.status_lbl.setText("Type at least 2 characters.")
             self.status_lbl.setStyleSheet(f"color: {TEXT3}; font-size: 12px;")
             return
-        self._search_timer.start(400)
+        self._search_timer.start(SEARCH_DEBOUNCE_MS)
 
     def _do_search(self):
         query = self.search_input.text().strip()
@@ -351,36 +426,90 @@ class PackagesScreen(QWidget):
             return
         self.status_lbl.setText(f"Searching for '{query}'...")
         self.status_lbl.setStyleSheet(f"color: {TEXT2}; font-size: 12px;")
-        self.results_list.clear()
         if self._search_worker and self._search_worker.isRunning():
-            self._search_worker.terminate()
+            self._search_worker.stop()
             self._search_worker.wait()
+        cached = self._cached_results(query)
+        if cached is not None:
+            # Orphan the old worker so its queued signals fail the sender check
+            self._search_worker = None
+            self._on_results(cached)
+            return
+        self.results_list.clear()
         self._search_worker = SearchWorker(query)
-        self._search_worker.results_ready.connect(self._on_results)
+        self._search_worker.batch_ready.connect(self._on_result_batch)
+        self._search_worker.results_ready.connect(self._on_search_done)
         self._search_worker.error_occurred.connect(self._on_search_error)
         self._search_worker.start()
 
+    def _on_result_batch(self, packages: list):
+        # Batches from a superseded search can still be queued; drop them
+        if self.sender() is self._search_worker:
+            self._append_results(packages)
+
+    def _on_search_done(self, packages: list):
+        if self.sender() is self._search_worker:
+            self._show_result_count(len(packages))
+            # A capped list may be missing matches, so only full ones are kept
+            if len(packages) < SEARCH_LIMIT:
+                self._result_cache[self._search_worker.query.lower()] = packages
+                if len(self._result_cache) > SEARCH_CACHE_SIZE:
+                    self._result_cache.popitem(last=False)
+
+    def _cached_results(self, query: str) -> list | None:
+        """
+        Results for query narrowed from a cached search for a substring of it,
+        or None. pacman -Ss matches substrings case-insensitively, so every hit
+        for "neovim" is already among the hits for "neo".
+        """
+        q = query.lower()
+        if _REGEX_CHARS.intersection(q):
+            return None
+        key = max((k for k in self._result_cache if k in q), key=len, default=None)
+        if key is None:
+            return None
+        self._result_cache.move_to_end(key)
+        return [pkg for pkg in self._result_cache[key]
+                if q in pkg["name"].lower() or q in pkg["desc"].lower()]
+
     def _on_results(self, packages: list):
-        self.results_list.clear()
-        if not packages:
+        # Rewrite the existing rows in place; only add or drop the difference
+        lst = self.results_list
+        lst.clearSelection()
+        while lst.count() > len(packages):
+            lst.takeItem(lst.count() - 1)
+        for row, pkg in enumerate(packages[:lst.count()]):
+            item = lst.item(row)
+            item.setData(Qt.ItemDataRole.UserRole, pkg)
+            self._mark_result(item, pkg, pkg["name"] in self._selected)
+        self._append_results(packages[lst.count():])
+        self._show_result_count(len(packages))
+
+    def _show_result_count(self, n: int):
+        if not n:
             self.status_lbl.setText("No results found.")
             self.status_lbl.setStyleSheet(f"color: {TEXT3}; font-size: 12px;")
             return
-        n = len(packages)
         self.status_lbl.setText(
             f"{n} result(s)  —  double-click or press Add to select"
         )
         self.status_lbl.setStyleSheet(f"color: {TEXT2}; font-size: 12px;")
+
+    def _append_results(self, packages: list):
         for pkg in packages:
-            tag = " [installed]" if pkg["installed"] else ""
-            sel = " [+]" if pkg["name"] in self._selected else ""
-            text = f"{pkg['repo']}/{pkg['name']}  {pkg['version']}{tag}{sel}"
-            item = QListWidgetItem(text)
+            item = QListWidgetItem()
             item.setData(Qt.ItemDataRole.UserRole, pkg)
-            if pkg["name"] in self._selected:
-                item.setForeground(QColor(PINK))
+            self._mark_result(item, pkg, pkg["name"] in self._selected)
             self.results_list.addItem(item)
 
+    @staticmethod
+    def _mark_result(item: QListWidgetItem, pkg: dict, selected: bool):
+        """Set a result row's text and colour for its selection state."""
+        tag = " [installed]" if pkg["installed"] else ""
+        sel = " [+]" if selected else ""
+        item.setText(f"{pkg['repo']}/{pkg['name']}  {pkg['version']}{tag}{sel}")
+        item.setData(Qt.ItemDataRole.ForegroundRole, QColor(PINK) if selected else None)
+
     def _on_search_error(self, msg: str):
         self.status_lbl.setText(f"Error: {msg}")
         self.status_lbl.setStyleSheet(f"color: {YELLOW}; font-size: 12px;")
@@ -412,23 +541,27 @@ class PackagesScreen(QWidget):
                 )
                 li.setData(Qt.ItemDataRole.UserRole, pkg)
                 self.selected_list.addItem(li)
+                # Show the [+] marker on just this row
+                self._mark_result(item, pkg, True)
         self._update_count()
-        # Refresh results to show [+] markers
-        current_pkgs = [
-            self.results_list.item(i).data(Qt.ItemDataRole.UserRole)
-            for i in range(self.results_list.count())
-        ]
-        self._on_results(current_pkgs)
 
     def _remove_selected(self):
         items = self.selected_list.selectedItems()
         if not items:
             return
+        removed = set()
         for item in items:
             pkg = item.data(Qt.ItemDataRole.UserRole)
             if pkg:
                 self._selected.pop(pkg["name"], None)
+                removed.add(pkg["name"])
             self.selected_list.takeItem(self.selected_list.row(item))
+        # Clear the [+] marker on any of them still in the results
+        for i in range(self.results_list.count()):
+            res = self.results_list.item(i)
+            pkg = res.data(Qt.ItemDataRole.UserRole)
+            if pkg and pkg["name"] in removed:
+                self._mark_result(res, pkg, False)
         self._update_count()
 
     def _update_count(self):
@@ -5,6 +5,7 @@ Audio, Bluetooth and Printing — choose your stack, Archey handles the rest.
 """
 
 import sys
+from itertools import chain
 from PyQt6.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout,
     QLabel, QPushButton, QFrame, QButtonGroup,
@@ -15,6 +16,39 @@ from theme import (MASTER_STYLE, PINK, PINK_DIM, ROSE, BG, BG2, BG3,
                    BORDER, TEXT, TEXT2, TEXT3, GREEN, YELLOW)
 
 
+# ── Card styles ───────────────────────────────────────────────────────────────
+# Built once; cards just swap between them on toggle
+
+_CARD_ACTIVE_CSS = f"""
+    QFrame {{
+        background-color: {PINK_DIM};
+        border: 2px solid {ROSE};
+        border-radius: 10px;
+    }}
+"""
+
+_CARD_INACTIVE_CSS = f"""
+    QFrame {{
+        background-color: {BG2};
+        border: 1px solid {BORDER};
+        border-radius: 10px;
+    }}
+    QFrame:hover {{ border-color: {ROSE}; }}
+"""
+
+_RADIO_CSS = f"""
+    QRadioButton::indicator {{
+        width: 16px; height: 16px;
+        border-radius: 8px;
+        border: 2px solid {BORDER};
+        background: {BG};
+    }}
+    QRadioButton::indicator:checked {{
+        background: {PINK}; border-color: {PINK};
+    }}
+"""
+
+
 # ── Audio stacks ──────────────────────────────────────────────────────────────
 
 AUDIO_OPTIONS = [
@@ -118,6 +152,12 @@ PRINTING_OPTIONS = [
     },
 ]
 
+# Static per-option display fields, derived once for the cards and summary
+for _opt in chain(AUDIO_OPTIONS, BLUETOOTH_OPTIONS, PRINTING_OPTIONS):
+    _opt["short"]          = _opt["name"].split("(")[0].strip()
+    _opt["pkg_count"]      = len(_opt["packages"])
+    _opt["packages_label"] = f"Packages: {', '.join(_opt['packages']) or 'none'}"
+
 
 # ── Section widget ─────────────────────────────────────────────────────────────
 
@@ -128,7 +168,7 @@ class OptionCard(QFrame):
     def __init__(self, option: dict, group: QButtonGroup):
         super().__init__()
         self.option = option
-        self._active = False
+        self._active = option["default"]
         self.setCursor(Qt.CursorShape.PointingHandCursor)
         self._apply_style()
 
@@ -138,17 +178,7 @@ class OptionCard(QFrame):
 
         self.radio = QRadioButton()
         self.radio.setChecked(option["default"])
-        self.radio.setStyleSheet(f"""
-            QRadioButton::indicator {{
-                width: 16px; height: 16px;
-                border-radius: 8px;
-                border: 2px solid {BORDER};
-                background: {BG};
-            }}
-            QRadioButton::indicator:checked {{
-                background: {PINK}; border-color: {PINK};
-            }}
-        """)
+        self.radio.setStyleSheet(_RADIO_CSS)
         self.radio.toggled.connect(self._on_toggle)
         group.addButton(self.radio)
         row.addWidget(self.radio)
@@ -160,7 +190,7 @@ class OptionCard(QFrame):
         desc = QLabel(option["desc"])
         desc.setStyleSheet(f"font-size: 11px; color: {TEXT2}; background: transparent;")
         desc.setWordWrap(True)
-        pkgs = QLabel(f"Packages: {', '.join(option['packages']) if option['packages'] else 'none'}")
+        pkgs = QLabel(option["packages_label"])
         pkgs.setStyleSheet(f"font-size: 10px; color: {TEXT3}; background: transparent;")
         text.addWidget(name); text.addWidget(desc); text.addWidget(pkgs)
         row.addLayout(text, stretch=1)
@@ -172,26 +202,11 @@ class OptionCard(QFrame):
             self.selected.emit(self.option)
 
     def _apply_style(self):
-        if self._active:
-            self.setStyleSheet(f"""
-                QFrame {{
-                    background-color: {PINK_DIM};
-                    border: 2px solid {ROSE};
-                    border-radius: 10px;
-                }}
-            """)
-        else:
-            self.setStyleSheet(f"""
-                QFrame {{
-                    background-color: {BG2};
-                    border: 1px solid {BORDER};
-                    border-radius: 10px;
-                }}
-                QFrame:hover {{ border-color: {ROSE}; }}
-            """)
+        self.setStyleSheet(_CARD_ACTIVE_CSS if self._active else _CARD_INACTIVE_CSS)
 
     def mousePressEvent(self, event):
-        self.radio.setChecked(True)
+        # click() rather than setChecked() so the group's buttonClicked fires
+        self.radio.click()
 
 
 class SectionWidget(QWidget):
@@ -216,20 +231,17 @@ class SectionWidget(QWidget):
         v.addLayout(hdr)
 
         group = QButtonGroup(self)
+        self._group = group
         for opt in options:
             card = OptionCard(opt, group)
             card.selected.connect(self._on_select)
-            if opt["default"]:
-                card._active = True
-                card._apply_style()
             v.addWidget(card)
             self._cards.append(card)
 
     def _on_select(self, option: dict):
+        # The old and new cards already restyled themselves from their
+        # radios' toggled signals; nothing else in the group changed
         self._selected = option
-        for card in self._cards:
-            card._active = card.option["id"] == option["id"]
-            card._apply_style()
 
     def get_selected(self) -> dict:
         return self._selected
@@ -295,10 +307,9 @@ class SystemScreen(QWidget):
         root.addWidget(self.summary)
         self._update_summary()
 
-        # Wire summary updates
+        # Wire summary updates — once per selection, not per toggled radio
         for section in (self.audio_section, self.bt_section, self.print_section):
-            for card in section._cards:
-                card.radio.toggled.connect(self._update_summary)
+            section._group.buttonClicked.connect(self._update_summary)
 
         # Buttons
         btn_row = QHBoxLayout()
@@ -319,11 +330,11 @@ class SystemScreen(QWidget):
         a = self.audio_section.get_selected()
         b = self.bt_section.get_selected()
         p = self.print_section.get_selected()
-        total = len(a["packages"]) + len(b["packages"]) + len(p["packages"])
+        total = a["pkg_count"] + b["pkg_count"] + p["pkg_count"]
         self.summary.setText(
-            f"Audio: {a['name'].split('(')[0].strip()}  |  "
-            f"Bluetooth: {b['name'].split('(')[0].strip()}  |  "
-            f"Printing: {p['name'].split('(')[0].strip()}  |  "
+            f"Audio: {a['short']}  |  "
+            f"Bluetooth: {b['short']}  |  "
+            f"Printing: {p['short']}  |  "
             f"{total} package(s)"
         )
 
@@ -332,15 +343,9 @@ class SystemScreen(QWidget):
         b = self.bt_section.get_selected()
         p = self.print_section.get_selected()
 
-        packages = []
-        services = []
-        seen = set()
-        for opt in (a, b, p):
-            for pkg in opt["packages"]:
-                if pkg not in seen:
-                    seen.add(pkg)
-                    packages.append(pkg)
-            services.extend(opt["systemd"])
+        # Order-preserving dedup — stacks can share packages (alsa-utils)
+        packages = list(dict.fromkeys(chain(a["packages"], b["packages"], p["packages"])))
+        services = list(chain(a["systemd"], b["systemd"], p["systemd"]))
 
         self.confirmed.emit(packages, services)
 
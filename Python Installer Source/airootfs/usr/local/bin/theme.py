@@ -4,7 +4,7 @@ Design direction: Dark Rose — deep charcoal with hot pink / cherry blossom acc
 """
 
 from PyQt6.QtWidgets import QGraphicsOpacityEffect, QWidget
-from PyQt6.QtCore import QPropertyAnimation, QEasingCurve, QParallelAnimationGroup, Qt
+from PyQt6.QtCore import QPropertyAnimation, QEasingCurve, Qt
 from PyQt6.QtGui import QColor
 
 # ── Palette ───────────────────────────────────────────────────────────────────
@@ -113,6 +113,37 @@ QRadioButton::indicator:checked {{
     background: {PINK}; border-color: {PINK};
 }}
 
+/* ── Option cards ── */
+QFrame#selectCard, QFrame#optCard {{
+    background-color: {BG2};
+    border: 1px solid {BORDER};
+    border-radius: 10px;
+}}
+QFrame#selectCard:hover {{ border-color: {ROSE}; }}
+QFrame#selectCard[active="true"] {{
+    background-color: {PINK_DIM};
+    border: 2px solid {ROSE};
+}}
+QLabel#cardText {{ color: {TEXT}; }}
+QRadioButton#cardRadio::indicator {{
+    width: 16px; height: 16px;
+    border-radius: 8px;
+    border: 2px solid {BORDER};
+    background: {BG};
+}}
+QRadioButton#cardRadio::indicator:checked {{
+    background: {PINK}; border-color: {PINK};
+}}
+QCheckBox#cardCheck::indicator {{
+    width: 16px; height: 16px;
+    border-radius: 3px;
+    border: 2px solid {BORDER};
+    background: {BG};
+}}
+QCheckBox#cardCheck::indicator:checked {{
+    background: {PINK}; border-color: {PINK};
+}}
+
 /* ── Slider ── */
 QSlider::groove:horizontal {{
     height: 6px; background: {BG3}; border-radius: 3px;
@@ -183,31 +214,24 @@ QPushButton#danger:hover {{ background: #ff8888; }}
 # ── Animated page transition ───────────────────────────────────────────────────
 
 def fade_transition(old_widget: QWidget, new_widget: QWidget, duration: int = 220):
-    """Fade out old, fade in new. Both must already be in the stack."""
-
-    # Fade out
-    fx_out = QGraphicsOpacityEffect(old_widget)
-    old_widget.setGraphicsEffect(fx_out)
-    anim_out = QPropertyAnimation(fx_out, b"opacity")
-    anim_out.setDuration(duration)
-    anim_out.setStartValue(1.0)
-    anim_out.setEndValue(0.0)
-    anim_out.setEasingCurve(QEasingCurve.Type.OutCubic)
-
-    # Fade in
+    """
+    Fade in new. Both must already be in the stack. The stack has already
+    hidden old, so only new gets an opacity effect, and only while animating —
+    a lingering QGraphicsOpacityEffect would render every later repaint of
+    the screen through an offscreen pixmap.
+    """
+    old_widget.setGraphicsEffect(None)
+
     fx_in = QGraphicsOpacityEffect(new_widget)
-    new_widget.setGraphicsEffect(fx_in)
     fx_in.setOpacity(0.0)
+    new_widget.setGraphicsEffect(fx_in)
     anim_in = QPropertyAnimation(fx_in, b"opacity")
     anim_in.setDuration(duration)
     anim_in.setStartValue(0.0)
     anim_in.setEndValue(1.0)
     anim_in.setEasingCurve(QEasingCurve.Type.InCubic)
-
-    group = QParallelAnimationGroup()
-    group.addAnimation(anim_out)
-    group.addAnimation(anim_in)
+    anim_in.finished.connect(lambda: new_widget.setGraphicsEffect(None))
 
     # Keep reference alive
-    new_widget._anim_group = group
-    group.start()
+    new_widget._fade_anim = anim_in
+    anim_in.start()
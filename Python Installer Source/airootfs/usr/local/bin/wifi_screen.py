@@ -4,8 +4,11 @@ Archey — Wi-Fi screen using iwctl (iwd).
 Auto-detects first wireless device, scans, lists networks, connects.
 """
 
+import collections
+import re
 import subprocess
 import sys
+import threading
 import time
 from PyQt6.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout,
@@ -18,6 +21,10 @@ from theme import MASTER_STYLE, PINK, PINK2, ROSE, TEXT, TEXT2, TEXT3, BG2, BORD
 
 # ── Helpers ───────────────────────────────────────────────────────────────────
 
+# iwctl colours its tables even when piped
+_ANSI_RE = re.compile(r'\x1b\[[0-9;]*[a-zA-Z]')
+
+
 def run(cmd: list, timeout: int = 15) -> tuple[int, str]:
     """Run a command, return (returncode, combined output)."""
     try:
@@ -31,31 +38,60 @@ def run(cmd: list, timeout: int = 15) -> tuple[int, str]:
         return 1, str(e)
 
 
+def run_lines(cmd: list, timeout: int = 15):
+    """
+    Run a command and yield its combined output one ANSI-stripped line at a
+    time. Raises CalledProcessError (output = last few lines) on failure.
+    """
+    try:
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE,
+                                stderr=subprocess.STDOUT, text=True)
+    except FileNotFoundError:
+        raise subprocess.CalledProcessError(1, cmd, f"{cmd[0]}: not found")
+
+    # Watchdog: kill the process if it outlives the timeout
+    watchdog = threading.Timer(timeout, proc.kill)
+    watchdog.start()
+    tail = collections.deque(maxlen=5)
+    try:
+        with proc.stdout:
+            for line in proc.stdout:
+                line = _ANSI_RE.sub('', line.rstrip("\n"))
+                tail.append(line)
+                yield line
+        rc = proc.wait()
+    finally:
+        watchdog.cancel()
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+    if rc != 0:
+        out = "timed out" if rc < 0 else "\n".join(tail).strip()
+        raise subprocess.CalledProcessError(rc, cmd, out)
+
+
 def iwctl(*args, timeout: int = 15) -> tuple[int, str]:
     return run(["iwctl"] + list(args), timeout)
 
 
 def strip_ansi(text: str) -> str:
-    import re
-    return re.sub(r'\x1b\[[0-9;]*[a-zA-Z]', '', text)
+    return _ANSI_RE.sub('', text)
 
 
 def find_device() -> str | None:
     """Return the first wireless device name (e.g. wlan0)."""
     rc, out = iwctl("device", "list")
     for line in out.splitlines():
-        clean = strip_ansi(line).strip()
+        clean = strip_ansi(line).lstrip()
         # Skip headers, dividers, empty lines
-        if not clean:
-            continue
-        if any(clean.startswith(x) for x in ("-", "─", "━", "Device", "device")):
-            continue
-        if "Name" in clean and "Powered" in clean:
+        if (not clean or clean[0] in "-─━"
+                or clean.startswith(("Device", "device"))
+                or ("Name" in clean and "Powered" in clean)):
             continue
-        parts = clean.split()
         # Device name should look like wlan0, wlp2s0, wlp3s0 etc.
-        if parts and (parts[0].startswith("wl") or parts[0].startswith("ww")):
-            return parts[0]
+        head, _, _ = clean.partition(" ")
+        if head.startswith(("wl", "ww")):
+            return head
     return None
 
 
@@ -76,15 +112,39 @@ def signal_bars(signal_str: str) -> str:
         return bars[min(stars, 4)]
 
 
+# Networks iwd already knows about are reused for this long before the
+# screen lists them again; an active RF scan only runs on "Scan again"
+SCAN_CACHE_TTL = 30.0
+
+# After connecting, poll for a DHCP lease every 100 ms for up to 3 s
+DHCP_POLL_INTERVAL = 0.1
+DHCP_WAIT_POLLS    = 30
+
+
 # ── Workers ───────────────────────────────────────────────────────────────────
 
 class ScanWorker(QThread):
-    """Finds device, triggers scan, waits, then lists networks."""
+    """
+    Finds device and lists networks. With rescan=True it first triggers an
+    active scan and waits for it; otherwise it reads the list iwd already has
+    (falling back to a scan if that list is empty).
+    """
     device_found   = pyqtSignal(str)
     results_ready  = pyqtSignal(list)   # list of dicts
     error_occurred = pyqtSignal(str)
 
+    def __init__(self, rescan: bool = False, start_iwd: bool = False):
+        super().__init__()
+        self.rescan    = rescan
+        self.start_iwd = start_iwd
+
     def run(self):
+        # 0. Start iwd if not running (first entry only)
+        if self.start_iwd:
+            run(["systemctl", "start", "iwd"])
+            run(["rfkill", "unblock", "wifi"])
+            time.sleep(1)
+
         # 1. Find device
         device = find_device()
         if not device:
@@ -101,20 +161,26 @@ class ScanWorker(QThread):
 
         self.device_found.emit(device)
 
-        # 2. Scan (non-blocking — iwctl returns immediately, scan runs async)
-        iwctl("station", device, "scan")
-        time.sleep(3)   # wait for scan to complete
-
-        # 3. Get networks
-        rc, out = iwctl("station", device, "get-networks")
-        if rc != 0:
-            self.error_occurred.emit(f"Could not list networks:\n{out}")
+        try:
+            networks = [] if self.rescan else self._get_networks(device)
+            if not networks:
+                # 2. Scan (non-blocking — iwctl returns immediately, scan runs async)
+                iwctl("station", device, "scan")
+                time.sleep(3)   # wait for scan to complete
+                networks = self._get_networks(device)
+        except subprocess.CalledProcessError as e:
+            self.error_occurred.emit(f"Could not list networks:\n{e.output}")
             return
 
-        networks = self._parse(out, device)
         self.results_ready.emit(networks)
 
-    def _parse(self, raw: str, device: str) -> list:
+    def _get_networks(self, device: str) -> list:
+        """3. Get networks — parsed as iwctl prints them."""
+        return self._parse(
+            run_lines(["iwctl", "station", device, "get-networks"]), device
+        )
+
+    def _parse(self, lines, device: str) -> list:
         """
         iwctl get-networks output looks like:
                                Available networks
@@ -127,7 +193,7 @@ class ScanWorker(QThread):
         seen = set()
         in_table = False
 
-        for line in raw.splitlines():
+        for line in lines:
             stripped = line.strip()
             if not stripped:
                 continue
@@ -141,11 +207,9 @@ class ScanWorker(QThread):
                 continue
 
             # Each data row: may have a ">" prefix for connected network
-            # Remove ANSI color codes
-            import re
-            clean = re.sub(r'\x1b\[[0-9;]*m', '', line)
-            connected = ">" in clean
-            clean = clean.replace(">", " ")
+            # (ANSI color codes are already stripped by run_lines)
+            connected = ">" in line
+            clean = line.replace(">", " ")
 
             parts = clean.split()
             if not parts:
@@ -199,14 +263,14 @@ class ConnectWorker(QThread):
             )
 
         if rc == 0:
-            # Wait a moment and verify we actually got an IP
-            time.sleep(2)
-            rc2, _ = run(["ping", "-c", "1", "-W", "3", "8.8.8.8"])
-            if rc2 == 0:
-                self.success.emit(self.ssid)
-            else:
-                # Still mark success — IP may take longer via DHCP
-                self.success.emit(self.ssid)
+            # Give DHCP a moment: stop as soon as an IPv4 address shows up.
+            # Success either way — the lease may take longer than this
+            for _ in range(DHCP_WAIT_POLLS):
+                time.sleep(DHCP_POLL_INTERVAL)
+                _, out = run(["ip", "-4", "-o", "addr", "show", "dev", self.device], timeout=1)
+                if " inet " in out:
+                    break
+            self.success.emit(self.ssid)
         else:
             self.failure.emit(out or "Connection failed — check your password.")
 
@@ -216,6 +280,9 @@ class ConnectWorker(QThread):
 class WifiScreen(QWidget):
     connected = pyqtSignal()
 
+    # Last scan, shared by every WifiScreen instance
+    _scan_cache = {"ts": 0.0, "device": None, "nets": []}
+
     def __init__(self):
         super().__init__()
         self._device       = None
@@ -274,7 +341,7 @@ class WifiScreen(QWidget):
         btn_row = QHBoxLayout()
         self.scan_btn = QPushButton("↻  Scan again")
         self.scan_btn.setObjectName("secondary")
-        self.scan_btn.clicked.connect(self._scan)
+        self.scan_btn.clicked.connect(lambda: self._scan(rescan=True))
         self.scan_btn.setEnabled(False)
 
         self.skip_btn = QPushButton("Skip (ethernet)")
@@ -295,22 +362,27 @@ class WifiScreen(QWidget):
     # ── iwd setup ─────────────────────────────────────────────────────────────
 
     def _ensure_iwd_and_scan(self):
-        """Start iwd service if not running, then scan."""
-        run(["systemctl", "start", "iwd"])
-        run(["rfkill", "unblock", "wifi"])
-        time.sleep(1)
-        self._scan()
+        """Show a fresh cached list if there is one, else start iwd and list."""
+        cache = self._scan_cache
+        if cache["device"] and time.monotonic() - cache["ts"] < SCAN_CACHE_TTL:
+            self._on_device_found(cache["device"])
+            self._on_scan_done(cache["nets"])
+            return
+        self._scan(start_iwd=True)
 
-    def _scan(self):
-        self.net_list.clear()
+    def _scan(self, rescan: bool = False, start_iwd: bool = False):
+        # Keep the old rows (greyed out) so _on_scan_done can reuse them
+        self.net_list.clearSelection()
+        self.net_list.setEnabled(False)
         self.pw_input.setVisible(False)
         self.conn_btn.setEnabled(False)
         self.scan_btn.setEnabled(False)
         self.status.setText("Scanning for networks...")
         self.progress.setVisible(True)
 
-        self._scan_worker = ScanWorker()
+        self._scan_worker = ScanWorker(rescan=rescan, start_iwd=start_iwd)
         self._scan_worker.device_found.connect(self._on_device_found)
+        self._scan_worker.results_ready.connect(self._cache_scan)
         self._scan_worker.results_ready.connect(self._on_scan_done)
         self._scan_worker.error_occurred.connect(self._on_scan_error)
         self._scan_worker.start()
@@ -319,9 +391,22 @@ class WifiScreen(QWidget):
         self._device = device
         self.device_lbl.setText(f"Device: {device}")
 
+    def _cache_scan(self, networks: list):
+        # An empty list may just mean iwd wasn't ready yet; scan again next time
+        if networks:
+            self._scan_cache.update(ts=time.monotonic(), device=self._device, nets=networks)
+
     def _on_scan_done(self, networks: list):
         self.progress.setVisible(False)
         self.scan_btn.setEnabled(True)
+        self.net_list.setEnabled(True)
+        self.net_list.clearSelection()
+
+        # Rewrite the previous scan's rows in place; only add or drop the difference
+        while self.net_list.count() > len(networks):
+            self.net_list.takeItem(self.net_list.count() - 1)
+        while self.net_list.count() < len(networks):
+            self.net_list.addItem(QListWidgetItem())
 
         if not networks:
             self.status.setText("No networks found. Try scanning again.")
@@ -329,17 +414,19 @@ class WifiScreen(QWidget):
 
         self.status.setText(f"{len(networks)} network(s) found")
 
-        for net in networks:
+        for row, net in enumerate(networks):
             bars = signal_bars(net["signal"])
             lock = "[+]" if net["security"] not in ("open", "") else "[ ]"
             tag  = "  <- connected" if net["connected"] else ""
-            item = QListWidgetItem(f"{bars}  {lock}  {net['ssid']}{tag}")
+            item = self.net_list.item(row)
+            item.setText(f"{bars}  {lock}  {net['ssid']}{tag}")
             item.setData(Qt.ItemDataRole.UserRole, net)
-            self.net_list.addItem(item)
 
     def _on_scan_error(self, msg: str):
         self.progress.setVisible(False)
         self.scan_btn.setEnabled(True)
+        self.net_list.clear()
+        self.net_list.setEnabled(True)
         self.status.setText(f"Error: {msg}")
         self.status.setStyleSheet(f"color: {YELLOW};")
 